@@ -0,0 +1,70 @@
+# External packages
+import sys
+import pandas as pd
+import time
+import os
+
+# Internal modules
+from artifacts import write_table
+from dblp.diff import diff_snapshot
+from dblp.ingest import init_scraped_fields, venues_to_dataframe
+from dblp.pipeline import iter_rows
+from dblp.prior import load_prior_corpus
+from dblp.records import peak_rss_mb
+import config
+
+
+# Does the work of 0-preprocess.py, 1-get_unique_venues.py and 2-init.py in a SINGLE streaming pass over the (optionally gzipped) raw DBLP xml:
+# the <ee></ee> tags are fixed on the fly, every venue is counted into <config.path_unique_venues>, and the <config.interesting_venues> are
+# filtered into <config.path_output>. No processed copy of DBLP is written to disk.
+# Set <config.ingest_workers> > 1 to parse an uncompressed xml in parallel shards.
+# TODO: Re-run this if (1) The <config.interesting_venues> list has changed or (2) There is a NEW DBLP snapshot.
+# Usage: python 0-2-ingest.py [input]   (defaults to config.path_input_raw; use "-" for stdin)
+def main():
+    path_in = sys.argv[1] if len(sys.argv) > 1 else config.path_input_raw
+    start = time.perf_counter()
+
+    # Articles already scraped from previously scraped VitaLITy corpus
+    papers_existing_in_prev_corpus = load_prior_corpus(config.path_prior_vitality_corpus, threshold=config.prior_match_threshold)
+    count_papers_existing = 0
+    count_papers_new = 0
+
+    unique_sources = dict()
+    result_list = list()
+    src_set = set()
+    progress = dict()
+    rows = iter_rows(path_in, config.interesting_venues, unique_sources,
+                     workers=config.ingest_workers, shard_size=config.ingest_shard_size,
+                     buffer_size=config.preprocess_buffer_size, progress=progress)
+    # Incremental update: keep the scraped fields of the records that are already in the previous output (see dblp/diff.py).
+    for obj, in_previous_output in diff_snapshot(rows, config.path_output, config.path_snapshot_diff, enabled=config.incremental_update):
+        if obj["source"] not in src_set:
+            src_set.add(obj["source"])
+            print(obj["source"])
+
+        # Initialize the fields that we are going to scrape (or reuse them if they have already been scraped before).
+        if in_previous_output or init_scraped_fields(obj, papers_existing_in_prev_corpus):
+            count_papers_existing += 1
+        else:
+            count_papers_new += 1
+
+        result_list.append(obj)
+        if len(result_list) % 5000 == 0:
+            print(count_papers_existing, count_papers_new)
+
+    # Final tally
+    print(count_papers_existing, count_papers_new)
+    print(papers_existing_in_prev_corpus.report())
+
+    # Save both outputs to disk
+    venues_to_dataframe(unique_sources).to_csv(config.path_unique_venues, header=True, sep='\t')
+    write_table(pd.DataFrame(result_list), config.path_output, export_tsv=config.export_tsv)
+
+    seconds = time.perf_counter() - start
+    mb = progress.get("bytes_read", 0) / (1024 * 1024)
+    print("Processed %.1f MB in %.1f s (%.1f MB/s). Peak RSS: %.0f MB" % (mb, seconds, mb / max(seconds, 1e-9), peak_rss_mb()))
+
+
+if __name__ == "__main__":
+    main()
+    sys.exit(os.EX_OK)  # code 0, all ok
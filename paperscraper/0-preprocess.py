@@ -1,28 +1,28 @@
 # External packages
-import re
+import sys
+import os
 
 # Internal modules
+from dblp.stream import preprocess
 import config
 
 
-# This Regular Find+Replace replaces instances of &amp; between <ee></ee> tags with a SPECIAL TAG `%26`. This tag will be replaced back to `&` in the code later on.
-regex_find = r'(<ee>.*)&amp;(.*</ee>)'
-regex_replace = r'\1%26\2'
+# Replace instances of &amp; between <ee></ee> tags with a SPECIAL TAG `%26`. This tag will be replaced back to `&` in the code later on.
+# The (optionally gzipped) DBLP xml is streamed in large chunks and every <ee></ee> is fixed in a single pass.
+# Usage: python 0-preprocess.py [input] [output]   (defaults to config.path_input_raw and config.path_input; use "-" for stdin/stdout)
+def main():
+    path_in = sys.argv[1] if len(sys.argv) > 1 else config.path_input_raw
+    path_out = sys.argv[2] if len(sys.argv) > 2 else config.path_input
 
-with open(config.path_input_raw, "r") as raw_dblp:
-    with open(config.path_input, "w") as processed_dblp:
-        for line in raw_dblp:
+    bytes_read, seconds = preprocess(path_in, path_out,
+                                     buffer_size=config.preprocess_buffer_size,
+                                     compresslevel=config.preprocess_compresslevel)
 
-            # Iterations are needed because re.sub replaces just 1 instance at a time
-            intermediate_result = ""
-            while line != intermediate_result:
-                intermediate_result = line
-                line = re.sub(regex_find, regex_replace, line)
+    # Report throughput (of the uncompressed xml) on stderr so that stdout can be piped into the next stage.
+    mb = bytes_read / (1024 * 1024)
+    print("Processed %.1f MB in %.1f s (%.1f MB/s)" % (mb, seconds, mb / max(seconds, 1e-9)), file=sys.stderr)
 
-            processed_dblp.write(line)
 
-# output_str = "<ee>http://www.graphicsinterface.org/proceedings/2001/129?a=1&amp;b=2&amp;c=3&amp;</ee>"
-# input_str = ""
-# while output_str != input_str:
-#     input_str = output_str
-#     output_str = re.sub(regex_find, regex_replace, output_str)
+if __name__ == "__main__":
+    main()
+    sys.exit(os.EX_OK)  # code 0, all ok
@@ -1,33 +1,38 @@
 # External packages
-import lxml.etree as ET
 import sys
-import pandas as pd
 import os
 
 # Internal modules
+from dblp.index import build_index, write_index
+from dblp.ingest import count_venue, venues_to_dataframe
+from dblp.records import iter_records, peak_rss_mb, record_tags
+from dblp.stream import is_seekable, open_dblp
 import config
 
 
 # Find Unique venues from the DBLP xml looking ONLY for ["article","inproceedings","incollection"] and ["journal", "booktitle"].
 # TODO: Re-run this if (1) The above list has changed OR (2) There is a NEW DBLP snapshot.
+# For an uncompressed xml on disk, this also persists a byte-offset index of the records of every venue to <config.path_venue_index>
+# so that 2-init.py can re-filter DBLP for a new <config.interesting_venues> list without parsing the whole file (see <config.use_venue_index>).
+# Usage: python 1-get_unique_venues.py [input]   (defaults to config.path_input; use "-" to read the output of 0-preprocess.py from stdin)
 def main():
-    unique_sources = dict()
-    for event, elem in ET.iterparse(config.path_input, recover=True):
-        if elem.tag in ["article","inproceedings","incollection"]:
-            for child in elem.getchildren():
-                if child.tag in ["journal", "booktitle"]:
-                    if child.text not in unique_sources:
-                        unique_sources[child.text] = dict()
-                        unique_sources[child.text]["count"] = 0
-                        unique_sources[child.text]["child_tag"] = child.tag
-                        unique_sources[child.text]["elem_tag"] = elem.tag
-                    unique_sources[child.text]["count"] += 1
+    path_in = sys.argv[1] if len(sys.argv) > 1 else config.path_input
+
+    if is_seekable(path_in):
+        unique_sources, index = build_index(path_in, buffer_size=config.preprocess_buffer_size)
+        write_index(config.path_venue_index, path_in, index)
+        print("venue index saved to disk.")
+    else:
+        unique_sources = dict()
+        for elem in iter_records(open_dblp(path_in), tags=record_tags):
+            count_venue(unique_sources, elem)
 
     # Create a Pandas DataFrame
-    df_unique_sources = pd.DataFrame.from_dict(unique_sources, orient="index")
+    df_unique_sources = venues_to_dataframe(unique_sources)
 
     # Save it to disk
     df_unique_sources.to_csv(config.path_unique_venues, header=True, sep='\t')
+    print("Peak RSS: %.0f MB" % peak_rss_mb())
 
 
 if __name__ == "__main__":
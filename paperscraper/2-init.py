@@ -1,87 +1,71 @@
 # External packages
-import lxml.etree as ET
 import sys
 import pandas as pd
 import os
 
 # Internal modules
+from artifacts import write_table
+from dblp.diff import diff_snapshot
+from dblp.index import is_index_valid, iter_indexed_rows
+from dblp.ingest import init_scraped_fields
+from dblp.pipeline import iter_rows
+from dblp.prior import load_prior_corpus
+from dblp.records import peak_rss_mb
 import config
 
 
 # FILTER the huge dblp_processed.xml file to keep just the data that we are interested in.
 # TODO: Re-run this if (1) The <config.interesting_venues> list has changed or (2) There is a NEW DBLP snapshot.
+# Set <config.ingest_workers> > 1 to parse an uncompressed xml in parallel shards, or <config.use_venue_index> to seek straight to the records
+# of the <config.interesting_venues> using the index built by 1-get_unique_venues.py.
+# Usage: python 2-init.py [input]   (defaults to config.path_input; use "-" to read the output of 0-preprocess.py from stdin)
 def main():
+    path_in = sys.argv[1] if len(sys.argv) > 1 else config.path_input
 
     # Articles already scraped from previously scraped VitaLITy corpus
-    papers_existing_in_prev_corpus = dict()
+    papers_existing_in_prev_corpus = load_prior_corpus(config.path_prior_vitality_corpus, threshold=config.prior_match_threshold)
     count_papers_existing = 0
     count_papers_new = 0
-    if os.path.exists(config.path_prior_vitality_corpus):
-        df_prev_corpus = pd.read_json(config.path_prior_vitality_corpus)
-        df_prev_corpus["unique_article_identifier"] = df_prev_corpus['Title'].astype(str) + '\t' + df_prev_corpus['Source'].astype(str) + '\t' + df_prev_corpus['Year'].astype(str)
-        papers_existing_in_prev_corpus = df_prev_corpus.set_index("unique_article_identifier").T.to_dict()
 
     result_list = list()
     result_counter = 0
     src_set = set()
-    for event, elem in ET.iterparse(config.path_input, encoding='UTF-8', recover=True):
-        obj = dict()
-        to_add = False
-        for child in elem.getchildren():
-            if child.tag not in obj:
-                if child.tag in ["author", "ee", "url"]:
-                    obj[child.tag] = list()
-                else:
-                    obj[child.tag] = None
+    if config.use_venue_index and is_index_valid(config.path_venue_index, path_in):
+        rows = iter_indexed_rows(path_in, config.path_venue_index, config.interesting_venues)
+    else:
+        if config.use_venue_index:
+            print("No valid venue index for " + str(path_in) + "; re-run 1-get_unique_venues.py. Parsing the whole file instead.")
+        rows = iter_rows(path_in, config.interesting_venues, dict(),
+                         workers=config.ingest_workers, shard_size=config.ingest_shard_size,
+                         buffer_size=config.preprocess_buffer_size)
+    # Incremental update: keep the scraped fields of the records that are already in the previous output (see dblp/diff.py).
+    for obj, in_previous_output in diff_snapshot(rows, config.path_output, config.path_snapshot_diff, enabled=config.incremental_update):
+        if obj["source"] not in src_set:
+            src_set.add(obj["source"])
+            print(obj["source"])
 
-            if child.tag in ["author", "ee", "url"]:
-                if child.text is not None:
-                    obj[child.tag].append(child.text.replace("%26", "&"))
-                else:
-                    obj[child.tag].append(child.text)
-            else:
-                obj[child.tag] = child.text # title, year, pgs
+        # Initialize the fields that we are going to scrape (or reuse them if they have already been scraped before).
+        if in_previous_output or init_scraped_fields(obj, papers_existing_in_prev_corpus):
+            count_papers_existing += 1
+        else:
+            count_papers_new += 1
 
-            # Only consider adding entries from the source defined above
-            if child.text in config.interesting_venues and child.tag == config.interesting_venues[child.text]["sourcetype"]:
-                obj["source"] = child.text
-                to_add = True
-                if child.text not in src_set:
-                    src_set.add(child.text)
-                    print(child.text)
-                    
-        if to_add:
-            # Initialize the fields that we are going to scrape.
-            # TODO: Update these if more fields are added.
-            obj["abstract"] = "Not Scraped"
-            obj["keywords"] = "Not Scraped"
-            obj["citation_count"] = "Not Scraped"
+        result_counter += 1
+        if result_counter % 5000 == 0:
+            print(count_papers_existing, count_papers_new)
 
-            # Update the above fields if they have already been scraped before.
-            _title = obj["title"] if obj["title"] is not None else ""
-            _source = obj["source"] if obj["source"] is not None else ""
-            unique_identifier = _title + "\t" + _source + "\t" + obj["year"]
-            if unique_identifier in papers_existing_in_prev_corpus:
-                obj["abstract"] = papers_existing_in_prev_corpus[unique_identifier]["Abstract"]
-                obj["keywords"] = papers_existing_in_prev_corpus[unique_identifier]["Keywords"]
-                count_papers_existing += 1
-            else:
-                count_papers_new += 1
-
-            result_counter += 1
-            if result_counter % 5000 == 0:
-                print(count_papers_existing, count_papers_new)
-
-            result_list.append(obj)
+        result_list.append(obj)
 
     # Final tally
     print(count_papers_existing, count_papers_new)
+    print(papers_existing_in_prev_corpus.report())
 
     # Create a DataFrame
     df_result_list = pd.DataFrame(result_list)
 
     # Save to disk
-    df_result_list.to_csv(config.path_output, sep='\t', header=True)
+    write_table(df_result_list, config.path_output, export_tsv=config.export_tsv)
+    print("Peak RSS: %.0f MB" % peak_rss_mb())
 
 if __name__ == "__main__":
     main()
@@ -1,197 +1,114 @@
 # External packages
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.by import By
 import pandas as pd
-import time
+import itertools
 import sys
 import os
-import ast
-import requests
+import time
 
 
 # Internal modules
-from scrapers.abstracts import get_abstract
-from scrapers.keywords import get_keywords
-from scrapers.citations import get_citation_count
+from artifacts import read_table, write_table
+from crawler.cache import open_cache
+from crawler.driver import new_driver_manager
+from crawler.errors import retry_queue_summary
+from crawler.fetchers import BrowserFetcher
+from crawler.http import is_static, scrape_static
+from crawler.journal import ResultsJournal, row_ids
+from crawler.offline import run_offline
+from crawler.plan import apply_updates, estimate_seconds, format_duration, select_work
+from crawler.pool import run_pool, run_sequential
+from crawler.scheduler import new_scheduler
+from crawler.worker import fields_to_scrape, merge_log, scrape_paper, task_url
 import config
 
 
-# get a new headless Chrome driver
-def get_webdriver_instance():
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.binary_location = config.path_chromeoptions_binary
-    service = Service(executable_path=config.path_chromedriver)
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    # driver.implicitly_wait(10000)
-    return driver
-
-
 def main():
-    # Get a webdriver instance (Headless Chrome)
-    driver = get_webdriver_instance()
-
     # Read the base datafile
-    df_papers = pd.read_csv(config.path_output, sep='\t', header=0)
+    df_papers = read_table(config.path_output)
 
     # Initialize a log object to analyze the summary of a particular run.
     log_obj = dict()
 
-    # Start scraping
-    for index, row in df_papers.iterrows():
-
-        # ToDo: Keep Checking this high-level filter to minimize iterations.
-        if (str(row["abstract"]) in __scraper_filter["abstract"] or
-            str(row["keywords"]) in __scraper_filter["keywords"] or
-            str(row["citation_count"]) in __scraper_filter["citation_count"]) \
-                and row["source"] in __publication_src:
-
-            if row["source"] not in log_obj:
-                log_obj[row["source"]] = dict()
-                log_obj[row["source"]]["papers"] = 0
-                log_obj[row["source"]]["abstract_parse_errors"] = 0
-                log_obj[row["source"]]["abstract_fetch_errors"] = 0
-                log_obj[row["source"]]["abstract_errors"] = 0
-                log_obj[row["source"]]["keyword_parse_errors"] = 0
-                log_obj[row["source"]]["keyword_fetch_errors"] = 0
-                log_obj[row["source"]]["keyword_errors"] = 0
-                log_obj[row["source"]]["no_of_citations_parse_errors"] = 0
-                log_obj[row["source"]]["no_of_citations_fetch_errors"] = 0
-                log_obj[row["source"]]["no_of_citations_errors"] = 0
-
-            # Increment no of papers
-            log_obj[row["source"]]["papers"] += 1
-
-            # Get the URLs
-            urls = []
-            try:
-                urls = ast.literal_eval(row["ee"])
-            except Exception as e:
-                # If not ee, check url.
-                # But, this doesn't have HTTP/HTTPS it seems to be following some Relative Paths from a BaseURL that is unknown.
-                # Hence, it will fail 99% of the times.
-                try:
-                    urls = ast.literal_eval(row["url"])
-                except:
-                    pass
-
-            # If there is No url OR If the URL begins with a db/, continue.
-            if len(urls) == 0 or urls[0].startswith("db/"):
-                df_papers.at[index, 'abstract'] = "No Url"
-                df_papers.at[index, 'keywords'] = "No Url"
-                df_papers.at[index, 'citation_count'] = "No Url"
-                print(str(index) + " [No URL]: " + row["title"])
-                continue
-
-            # ABSTRACT
-            abstract_soup = None
-            try:
-                driver.get(urls[0])
-
-                # Delay to ensure routings are complete, page renders
-                time.sleep(10)
-
-                # Initialize the Soup object
-                abstract_soup = BeautifulSoup(driver.page_source, 'lxml')
-
-            except Exception as e:
-                print('Abstract: ' + str(e))
-
-            if abstract_soup is not None:
-                is_abstract = False
-                for publisher in config.interesting_venues[row["source"]]["publishers"]:
-                    abstract = get_abstract(publisher, abstract_soup)
-                    if abstract is not None and str(row["abstract"]) in __scraper_filter["abstract"]:
-                        df_papers.at[index, 'abstract'] = abstract
-                        print(str(index) + " [Success][Abstract] " + str(urls[0]) + " " + str(abstract)[:50])
-                        is_abstract = True
-                        break
-
-                if not is_abstract:
-                    df_papers.at[index, 'abstract'] = "Error"
-                    print(str(index) + " [Error][Abstract Parse]: " + str(urls[0]) + " : " + str(row["source"]))
-                    log_obj[row["source"]]["abstract_parse_errors"] += 1
-                    log_obj[row["source"]]["abstract_errors"] += 1
-
-            else:
-                df_papers.at[index, 'abstract'] = "Error"
-                print(str(index) + " [Error][Abstract URL Fetch]: " + str(row["source"]))
-                log_obj[row["source"]]["abstract_fetch_errors"] += 1
-                log_obj[row["source"]]["abstract_errors"] += 1
-
-            # No. of CITATIONS
-            citation_soup = abstract_soup
-            if citation_soup is not None:
-                is_citation = False
-                for publisher in config.interesting_venues[row["source"]]["publishers"]:
-                    citation_count = get_citation_count(publisher, citation_soup)
-                    if citation_count is not None and str(row["citation_count"]) in __scraper_filter["citation_count"]:
-                        df_papers.at[index, 'citation_count'] = citation_count
-                        print(str(index) + " [Success][Citation Count] " + str(urls[0]) + " " + str(citation_count))
-                        is_citation = True
-                        break
-
-                if not is_citation:
-                    df_papers.at[index, 'citation_count'] = "Error"
-                    print(str(index) + " [Error][Citation Parse]: " + str(urls[0]) + " : " + str(row["source"]))
-                    log_obj[row["source"]]["no_of_citations_parse_errors"] += 1
-                    log_obj[row["source"]]["no_of_citations_errors"] += 1
-
-            else:
-                df_papers.at[index, 'citation_count'] = "Error"
-                print(str(index) + " [Error][Citation Count URL Fetch]: " + str(row["source"]))
-                log_obj[row["source"]]["no_of_citations_fetch_errors"] += 1
-                log_obj[row["source"]]["no_of_citations_errors"] += 1
-
-            # KEYWORDS
-            # Redirect to a different URL to fetch KEYWORDS in some cases.
-            is_keyword = False
-            current_url = driver.current_url
-            for publisher in config.interesting_venues[row["source"]]["publishers"]:
-                try:
-                    if publisher == "ieee_explore":
-                        driver.get(current_url+ "/keywords#keywords")
-                    elif publisher == "eurographics_digital_library":
-                        driver.get(current_url + "?show=full")
-                    else:
-                        driver.get(current_url)
-
-                    # Delay to ensure routings are complete, page renders
-                    time.sleep(1.5)
-
-                    # Initialize the Soup object
-                    keyword_soup = BeautifulSoup(driver.page_source, 'lxml')
-
-                    if keyword_soup is not None:
-                        keywords_list = get_keywords(publisher, keyword_soup)
-                        if keywords_list is not None and str(row["keywords"]) in __scraper_filter["keywords"]:
-                            df_papers.at[index, 'keywords'] = keywords_list
-                            print(str(index) + " [Success][Keywords] " + str(urls[0]) + " " + str(keywords_list))
-                            is_keyword = True
-                            break
-                    else:
-                        df_papers.at[index, 'keywords'] = "Error"
-                        print(str(index) + " [Error][Keywords URL Fetch]: " + str(row["source"]))
-                        log_obj[row["source"]]["keyword_fetch_errors"] += 1
-                        log_obj[row["source"]]["keyword_errors"] += 1
-
-                except Exception as e:
-                    pass
-
-            if not is_keyword:
-                df_papers.at[index, 'keywords'] = "Error"
-                print(str(index) + " [Error][Keywords Parse]: " + str(urls[0]) + " : " + str(row["source"]))
-                log_obj[row["source"]]["keyword_parse_errors"] += 1
-                log_obj[row["source"]]["keyword_errors"] += 1
+    # Resume an interrupted run: replay the rows it journaled (see crawler/journal.py) and skip them below.
+    ids = row_ids(df_papers)
+    indices = {row_id: index for index, row_id in ids.items()}
+    journal = ResultsJournal(config.path_journal, config.journal_flush_rows)
+    journaled = set()
+    replayed = dict()
+    for entry in journal.load():
+        if entry["id"] in indices:
+            replayed.setdefault(indices[entry["id"]], dict()).update(entry["updates"])
+            merge_log(log_obj, entry["source"], entry["log"])
+            journaled.add(entry["id"])
+    apply_updates(df_papers, replayed)
+    if len(journaled) > 0:
+        print("Resuming: " + str(len(journaled)) + " papers already done in " + config.path_journal + ".")
+
+    # Rows to scrape: selected on whole columns and prioritized (see crawler/plan.py); only those rows are turned into dicts.
+    # Failed fields are only wanted once they are due for a retry (see crawler/errors.py).
+    now = time.time()
+    work = select_work(df_papers, __scraper_filter, __publication_src, {indices[row_id] for row_id in journaled}, now, every_row=config.reextract_from_cache)
+    tasks = list(zip(work, df_papers.loc[work].to_dict("records")))
+
+    waiting, given_up, next_due = retry_queue_summary(df_papers, now)
+    if len(waiting) > 0 or len(given_up) > 0:
+        print("Retry queue: " + str(sum(waiting.values())) + " failed fields wait for a retry " + str(waiting) +
+              (" (next due " + time.strftime("%Y-%m-%d %H:%M", time.localtime(next_due)) + ")" if next_due is not None else "") +
+              ", " + str(sum(given_up.values())) + " are given up on " + str(given_up) + ".")
+
+    manager = None
+    scheduler = None
+    if config.reextract_from_cache:
+        # Re-run the extractors over the cached pages only, without any network access (see crawler/offline.py).
+        print(str(len(tasks)) + " papers to re-extract from " + config.path_html_cache + ".")
+        results = run_offline(tasks, config.reextract_workers)
+    else:
+        # Papers whose wanted fields none of their publishers provide (see scrapers/registry.py) are not fetched at all.
+        unfetched_tasks = [task for task in tasks if len(fields_to_scrape(task[1], __scraper_filter)) == 0]
+        tasks = [task for task in tasks if len(fields_to_scrape(task[1], __scraper_filter)) > 0]
+        unfetched_results = ((index, row["source"]) + scrape_paper(None, index, row, __scraper_filter) for index, row in unfetched_tasks)
+
+        # Static publishers are fetched over plain HTTP (see <config.publisher_fetch>); the others need a browser.
+        http_tasks = [task for task in tasks if is_static(task[1])]
+        browser_tasks = [task for task in tasks if not is_static(task[1])]
+        print(str(len(http_tasks)) + " papers to fetch over HTTP, " + str(len(browser_tasks)) + " with the browser, " +
+              str(len(unfetched_tasks)) + " without fetching.")
+
+        # Every publisher host is kept within its limits and the rows are interleaved across hosts (see crawler/scheduler.py).
+        scheduler = new_scheduler()
+        print(str(len(tasks)) + " papers to do, estimated time: " + format_duration(estimate_seconds(http_tasks, browser_tasks, scheduler, task_url)) + ".")
+
+        # Start scraping: either with <config.scraper_workers> headless Chrome processes, or with ONE headless Chrome in this process.
+        # Every fetched page is kept in the on-disk cache (see crawler/cache.py).
+        if len(browser_tasks) == 0:
+            browser_results = iter(())
+        elif config.scraper_workers > 1:
+            browser_results = run_pool(browser_tasks, config.scraper_workers, __scraper_filter, scheduler)
+        else:
+            manager = new_driver_manager()
+            browser_results = run_sequential(BrowserFetcher(None, open_cache()), browser_tasks, __scraper_filter, scheduler, manager=manager)
+        results = itertools.chain(unfetched_results, scrape_static(http_tasks, __scraper_filter, scheduler), browser_results)
+
+    # The results are journaled as they come, and written into the table all at once at the end (see <apply_updates>).
+    scraped = dict()
+    try:
+        for index, source, updates, log in results:
+            scraped.setdefault(index, dict()).update(updates)
+            merge_log(log_obj, source, log)
+            journal.append(ids[index], source, updates, log)
+    finally:
+        journal.close()
+        if manager is not None:
+            manager.quit()
+
+    if scheduler is not None:
+        print("Hosts (final concurrency and rate):", scheduler.summary())
 
     # Persist the paper file
+    apply_updates(df_papers, scraped)
     print("---------------")
-    df_papers.to_csv(config.path_output, sep='\t', header=True, index=False)
+    write_table(df_papers, config.path_output, export_tsv=config.export_tsv)
+    journal.remove()
     print("scraped papers saved to disk.")
 
     # Persist Logs
@@ -209,7 +126,8 @@ if __name__ == "__main__":
     __publication_src = list(config.interesting_venues.keys())
 
     # Process only the below scraped STATES
-    # Possible values: ["Not Scraped", "Error", "No Url"]
+    # Possible values: ["Not Scraped", "Error", "No Url", "Unsupported"]
+    # "Error" fields are only retried once due, and never for permanent errors (see crawler/errors.py and <config.retry_backoff>).
     __scraper_filter = {
         "keywords": ["Not Scraped", "Error", "No Url"],
         "abstract": ["Not Scraped", "Error", "No Url"],
@@ -219,4 +137,4 @@ if __name__ == "__main__":
     # Scrap the Abstracts, Keywords, and Citations
     main()
 
-    sys.exit(os.EX_OK) # code 0, all ok
\ No newline at end of file
+    sys.exit(os.EX_OK) # code 0, all ok
@@ -1,8 +1,6 @@
 # External packages
 import sys
 import os
-import pandas as pd
-import ast
 import string
 import unicodedata
 import re
@@ -10,6 +8,7 @@ import string
 
 
 # Internal modules
+from artifacts import read_table, write_table
 import config
 regex = re.compile(r'[\n\r\t]')
 set_punctuations = set(string.punctuation)
@@ -34,7 +33,7 @@ def process_title(title_string):
 
 def process_abstract(abstract_string):
     try:
-        if abstract_string in ["Not Scraped", "Error", "No Url"]:
+        if abstract_string in ["Not Scraped", "Error", "No Url", "Unsupported"]:
             return None
 
         if not (50 < len(abstract_string) < 2500):
@@ -45,16 +44,15 @@ def process_abstract(abstract_string):
         # print(e)
         return None
 
-def process_authors(author_string):
+def process_authors(author_list):
     try:
-        author_list = ast.literal_eval(author_string)
         if isinstance(author_list, list):
             recoded_author_list = [string.capwords(_author.encode('ascii', 'ignore').decode('UTF-8')) for _author in author_list]
-            return str(recoded_author_list)
+            return recoded_author_list
     except Exception as e:
         # print(e)
         pass
-    return author_string
+    return author_list
 
 
 def process_citation_counts(citation_count_string):
@@ -67,9 +65,8 @@ def process_citation_counts(citation_count_string):
         return None
 
 
-def process_keywords(keywords_string):
+def process_keywords(keywords_list):
     try:
-        keywords_list = ast.literal_eval(keywords_string)
         if isinstance(keywords_list, list):
             processed_keywords_list = list()
 
@@ -124,7 +121,7 @@ def process_keywords(keywords_string):
             # Let's capitalize the keywords so that they look nice.
             processed_keywords_list = [string.capwords(kw) for kw in processed_keywords_list]
 
-            return str(processed_keywords_list)
+            return processed_keywords_list
     except Exception as e:
         # print(e)
         pass
@@ -133,7 +130,7 @@ def process_keywords(keywords_string):
 
 def main():
     # Read it
-    df_scraped_input = pd.read_csv(config.path_output, sep='\t', index_col=0)
+    df_scraped_input = read_table(config.path_output)
 
     # Process authors
     # 1) Convert utf-8 characters to ascii (will result in data loss but ignore errors) so that they are searchable via a keyboard.
@@ -156,7 +153,7 @@ def main():
     df_scraped_input["title_processed"] = df_scraped_input.apply(lambda row: process_title(row["title"]), axis=1)
 
     # Save POST-PROCESSED FILE
-    df_scraped_input.to_csv(config.path_postprocessing_output, sep='\t', header=True)
+    write_table(df_scraped_input, config.path_postprocessing_output, export_tsv=config.export_tsv)
 
 
 if __name__ == "__main__":
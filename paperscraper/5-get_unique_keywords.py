@@ -1,26 +1,22 @@
 # External packages
 import sys
 import pandas as pd
-import ast
 import os
 
 # Internal modules
+from artifacts import as_list, read_table
 import config
 
 
 def main():
 
     # Read input file
-    df_scraped_input = pd.read_csv(config.path_postprocessing_output, sep='\t', index_col=0)
+    df_scraped_input = read_table(config.path_postprocessing_output)
 
     unique_keywords = set()
     for index, row in df_scraped_input.iterrows():
-        keywords_list = list()
-        try:
-            keywords_list = ast.literal_eval(row["keywords_processed"])
-        except Exception as e:
-            # These are mostly 'ERROR' and 'No Url' strings that are actually Error Codes defined in the scraper.
-            pass
+        # These are mostly 'ERROR' and 'No Url' strings (that are actually Error Codes defined in the scraper) if not a list.
+        keywords_list = as_list(row["keywords_processed"])
 
         if isinstance(keywords_list, list):
             for kw in keywords_list:
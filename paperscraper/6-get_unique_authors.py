@@ -1,26 +1,22 @@
 # External packages
 import sys
 import pandas as pd
-import ast
 import os
 
 # Internal modules
+from artifacts import as_list, read_table
 import config
 
 
 def main():
 
     # Read input file
-    df_scraped_input = pd.read_csv(config.path_postprocessing_output, sep='\t', index_col=0)
+    df_scraped_input = read_table(config.path_postprocessing_output)
 
     unique_authors = set()
     for index, row in df_scraped_input.iterrows():
-        authors_list = list()
-        try:
-            authors_list = ast.literal_eval(row["author_processed"])
-        except Exception as e:
-            # These are mostly 'ERROR' and 'No Url' strings that are actually Error Codes defined in the scraper.
-            pass
+        # These are mostly 'ERROR' and 'No Url' strings (that are actually Error Codes defined in the scraper) if not a list.
+        authors_list = as_list(row["author_processed"])
 
         if isinstance(authors_list, list):
             for au in authors_list:
@@ -0,0 +1,106 @@
+# External packages
+import pandas as pd
+import ast
+import os
+
+
+# The papers tables (<config.path_output>, <config.path_postprocessing_output>) are stored as Parquet by default: typed columns, native
+# list columns instead of stringified Python lists, dictionary-encoded venue columns and compression. A path ending with `.tsv` keeps the
+# old tab-separated format.
+
+# Columns that hold lists (e.g., ['Author A', 'Author B']).
+list_columns = ["author", "ee", "url", "keywords", "author_processed", "keywords_processed"]
+
+# Columns with few distinct values that are dictionary-encoded.
+category_columns = ["source", "journal", "booktitle"]
+
+# A list column may also hold a status string instead of a list (e.g., "Not Scraped", "Error", "No Url"). In Parquet, the list itself goes
+# to the list column and the status string to this companion column.
+status_suffix = "__status"
+
+compression = "zstd"
+
+
+def is_parquet(path):
+    return str(path).endswith(".parquet")
+
+
+def tsv_path(path):
+    return os.path.splitext(path)[0] + ".tsv"
+
+
+# Return <value> as a list. Accepts native lists (Parquet), stringified lists (TSV) and anything else (which gives an empty list).
+def as_list(value):
+    if isinstance(value, list):
+        return value
+    if hasattr(value, "tolist"):
+        return list(value.tolist())
+    if isinstance(value, str) and value.startswith("["):
+        try:
+            return list(ast.literal_eval(value))
+        except Exception as e:
+            pass
+    return list()
+
+
+def _is_list(value):
+    return isinstance(value, list) or hasattr(value, "tolist")
+
+
+def _to_str(value):
+    if value is None or isinstance(value, str):
+        return value
+    try:
+        if pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        pass
+    return str(value)
+
+
+def read_table(path):
+    # Fall back to the TSV of an earlier run, e.g., output.tsv before switching to output.parquet.
+    if is_parquet(path) and not os.path.exists(path) and os.path.exists(tsv_path(path)):
+        print("Reading " + tsv_path(path) + " (" + path + " does not exist yet).")
+        path = tsv_path(path)
+
+    if not is_parquet(path):
+        df = pd.read_csv(path, sep='\t', header=0)
+        if len(df.columns) > 0 and df.columns[0].startswith("Unnamed: 0"):
+            df = df.set_index(df.columns[0]).rename_axis(None)
+        for column in list_columns:
+            if column in df.columns:
+                df[column] = [as_list(value) if isinstance(value, str) and value.startswith("[") else value for value in df[column]]
+        return df
+
+    df = pd.read_parquet(path)
+    for column in list_columns:
+        if column in df.columns:
+            values = [value.tolist() if value is not None else None for value in df[column]]
+            if column + status_suffix in df.columns:
+                values = [status if status is not None else value for value, status in zip(values, df[column + status_suffix])]
+                df = df.drop(columns=[column + status_suffix])
+            df[column] = pd.Series(values, index=df.index, dtype=object)
+    return df
+
+
+def write_table(df, path, export_tsv=False):
+    if not is_parquet(path):
+        df.to_csv(path, sep='\t', header=True)
+        return
+
+    df_out = df.copy()
+    for column in df_out.columns:
+        if column in list_columns:
+            values = df_out[column].tolist()
+            df_out[column] = pd.Series([list(value) if _is_list(value) else None for value in values], index=df_out.index, dtype=object)
+            df_out[column + status_suffix] = pd.Series([None if _is_list(value) else _to_str(value) for value in values], index=df_out.index, dtype=object)
+        elif column in category_columns:
+            df_out[column] = df_out[column].map(_to_str).astype("category")
+        elif df_out[column].dtype == object:
+            # Free-text and status columns (e.g., abstract, citation_count) are stored as strings.
+            df_out[column] = df_out[column].map(_to_str)
+    df_out.to_parquet(path, compression=compression, index=True)
+
+    if export_tsv:
+        df.to_csv(tsv_path(path), sep='\t', header=True)
@@ -0,0 +1,122 @@
+# External packages
+import sys
+import os
+import time
+import tracemalloc
+
+
+# Internal modules
+from artifacts import read_table
+from crawler.driver import get_webdriver_instance
+from crawler.fetchers import BrowserFetcher
+from crawler.worker import paper_urls
+from scrapers.dom import parse_html
+from scrapers.extract import extract_all, in_page_fields, landing_page_fields
+from scrapers.in_page import extraction_script, parse_values
+from scrapers.registry import publishers, resolve
+import config
+
+
+# Publishers that have in-page (JavaScript) extractors, see scrapers/in_page.py.
+in_page_publishers = [publisher for publisher, entry in publishers.items() if "in_page" in entry]
+
+
+# Landing pages to benchmark: the URLs given on the command line, or the first <config.benchmark_papers> papers of the table whose venue has
+# a publisher with in-page extractors.
+def sample_urls():
+    if len(sys.argv) > 1:
+        return sys.argv[1:]
+    df_papers = read_table(config.path_output)
+    urls = list()
+    for index, row in df_papers.iterrows():
+        venue_publishers = config.interesting_venues.get(row["source"], dict()).get("publishers", [])
+        row_urls = paper_urls(row)
+        if any(publisher in in_page_publishers for publisher in venue_publishers) and len(row_urls) > 0 and not row_urls[0].startswith("db/"):
+            urls.append(row_urls[0])
+        if len(urls) >= config.benchmark_papers:
+            break
+    return urls
+
+
+# Time <extract> and measure the Python memory it allocates. Returns (values, seconds, peak bytes).
+def measure(extract):
+    tracemalloc.start()
+    started = time.perf_counter()
+    values = extract()
+    seconds = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return values, seconds, peak
+
+
+# Same keywords in a different order are the same result.
+def same(a, b):
+    if isinstance(a, list) and isinstance(b, list):
+        return sorted(a) == sorted(b)
+    return a == b
+
+
+# Compare, on the same loaded pages, the current path (page_source over the WebDriver wire, parsed and extracted in Python) with the in-page
+# extractors (ONE execute_script call that returns a small JSON object): time, bytes transferred, Python memory, and whether the results agree.
+def main():
+    urls = sample_urls()
+    driver = get_webdriver_instance()
+    fetcher = BrowserFetcher(driver)
+    totals = {"source_seconds": 0.0, "source_bytes": 0, "source_peak": 0, "in_page_seconds": 0.0, "in_page_bytes": 0, "in_page_peak": 0}
+    pages = 0
+    mismatches = 0
+    try:
+        for url in urls:
+            try:
+                fetcher.load(url, in_page_publishers, config.page_ready_timeout)
+            except Exception as e:
+                print("[Error][Load] " + str(url) + " " + str(e))
+                continue
+            publisher = next((publisher for publisher in resolve(fetcher.current_url, in_page_publishers) if publisher in in_page_publishers), None)
+            if publisher is None:
+                print("[Skipped][No in-page extractors] " + str(fetcher.current_url))
+                continue
+            fields = in_page_fields(publisher, landing_page_fields(publisher, ["abstract", "citation_count", "keywords"]))
+
+            def from_source():
+                page_source = driver.page_source
+                return extract_all(publisher, parse_html(page_source), fields), len(page_source.encode("utf-8"))
+
+            def from_page():
+                # Same as <extract_in_page> in scrapers/in_page.py, to also get the size of the JSON that crossed the wire.
+                result = driver.execute_script(extraction_script({field: publishers[publisher]["in_page"][field] for field in fields}))
+                return parse_values(result, fields), len(result.encode("utf-8"))
+
+            (source_values, source_bytes), source_seconds, source_peak = measure(from_source)
+            (in_page_values, in_page_bytes), in_page_seconds, in_page_peak = measure(from_page)
+
+            pages += 1
+            totals["source_seconds"] += source_seconds
+            totals["source_bytes"] += source_bytes
+            totals["source_peak"] = max(totals["source_peak"], source_peak)
+            totals["in_page_seconds"] += in_page_seconds
+            totals["in_page_bytes"] += in_page_bytes
+            totals["in_page_peak"] = max(totals["in_page_peak"], in_page_peak)
+            differing = [field for field in fields if not same(source_values[field], in_page_values[field])]
+            mismatches += len(differing)
+            print("[" + publisher + "] " + str(url) + ": page_source " + str(round(source_seconds * 1000, 1)) + " ms, " + str(source_bytes) + " bytes; in-page "
+                  + str(round(in_page_seconds * 1000, 1)) + " ms, " + str(in_page_bytes) + " bytes" + (" [Differs] " + str(differing) if differing else ""))
+    finally:
+        driver.quit()
+
+    if pages == 0:
+        print("No page benchmarked.")
+        return
+    print("Pages: " + str(pages) + ", fields that differ: " + str(mismatches))
+    print("page_source + parse: " + str(round(totals["source_seconds"] / pages * 1000, 1)) + " ms/page, " + str(totals["source_bytes"] // pages) + " bytes/page, peak "
+          + str(totals["source_peak"] // 1024) + " KiB")
+    print("in-page:             " + str(round(totals["in_page_seconds"] / pages * 1000, 1)) + " ms/page, " + str(totals["in_page_bytes"] // pages) + " bytes/page, peak "
+          + str(totals["in_page_peak"] // 1024) + " KiB")
+
+
+if __name__ == "__main__":
+
+    # Benchmark the in-page extractors (see <config.in_page_extraction>)
+    main()
+
+    sys.exit(os.EX_OK) # code 0, all ok
@@ -1,16 +1,42 @@
 import os
 
 # ToDo: [Update as required] Paths to important input/output files
-path_input_raw = os.path.join("..", "assets", "data", "dblp.xml")
+path_input_raw = os.path.join("..", "assets", "data", "dblp.xml.gz")  # Either the .xml.gz as shipped by DBLP or the unzipped .xml
 path_input = os.path.join("..", "assets", "data", "dblp_processed.xml")
-path_output = os.path.join("..", "output", "output.tsv")
-path_postprocessing_output = os.path.join("..", "output", "output_processed.tsv")
+# The papers tables are stored as Parquet (typed columns with native lists, see artifacts.py). Use a `.tsv` path to keep the old format.
+path_output = os.path.join("..", "output", "output.parquet")
+path_postprocessing_output = os.path.join("..", "output", "output_processed.parquet")
 path_unique_venues = os.path.join("..", "output", "unique_venues.tsv")
+path_venue_index = os.path.join("..", "output", "venue_index.tsv.gz")
+path_snapshot_diff = os.path.join("..", "output", "snapshot_diff.tsv")
 path_unique_keywords = os.path.join("..", "output", "unique_keywords.tsv")
 path_unique_authors = os.path.join("..", "output", "unique_authors.tsv")
 path_logfile = os.path.join("..", "output", "log.tsv")
 path_prior_vitality_corpus = os.path.join("..", "assets", "data", "VitaLITy-1.0.0.json")
 
+# Also write a `.tsv` copy (with stringified lists) next to every Parquet papers table, e.g., for a quick look in a spreadsheet.
+export_tsv = False
+
+# Minimum similarity (0-1) of two normalized titles (of the same year and venue) to reuse a paper of the prior VitaLITy corpus.
+prior_match_threshold = 0.93
+
+# Preprocessing: size of the chunks streamed through the <ee></ee> fix, and the gzip level used if <path_input> ends with `.gz`.
+preprocess_buffer_size = 16 * 1024 * 1024
+preprocess_compresslevel = 1
+
+# Ingest (0-2-ingest.py, 2-init.py): number of processes used to parse the DBLP xml, e.g., os.cpu_count(). Parallel parsing needs an
+# uncompressed xml on disk, which is split into shards of roughly <ingest_shard_size> bytes at record boundaries.
+ingest_workers = 1
+ingest_shard_size = 64 * 1024 * 1024
+
+# 2-init.py: seek straight to the records of the <interesting_venues> using the byte-offset index that 1-get_unique_venues.py persists to
+# <path_venue_index>, instead of parsing the whole DBLP xml. Handy after adding a venue below. The index has to be rebuilt for a NEW DBLP snapshot.
+use_venue_index = False
+
+# 2-init.py, 0-2-ingest.py: incremental update for a NEW DBLP snapshot. Records already in <path_output> (matched on their DBLP `key`) keep
+# their scraped fields, and only the added/changed/removed records are listed in <path_snapshot_diff>. Removed records are dropped.
+incremental_update = False
+
 # ChromeDriver
 # TODO Option 1: Manual Download  from https://chromedriver.chromium.org/downloads (e.g., ChromeDriver 114.0.5735.90) and save to a known location in PATH
 # TODO Option 2: Install using brew: `brew install chromedriver --cask`. It was saved to `/opt/homebrew/bin/chromedriver` on MacOSX Sonoma 14.6
@@ -22,6 +48,154 @@ path_chromedriver = os.path.join("/", "opt", "homebrew", "bin", "chromedriver")
 # TODO: [Update this path depending on where it is located in your Operating System]
 path_chromeoptions_binary = os.path.join("/", "Applications", "Google Chrome.app", "Contents", "MacOS", "Google Chrome")
 
+# 3-update.py: number of headless Chrome worker processes that scrape papers in parallel. 1 scrapes sequentially in the main process.
+scraper_workers = 1
+
+# Lean browsing profile of the headless Chrome (see crawler/driver.py): the scrapers only read the DOM, so Chrome does not need to download
+# the resources of the <browser_blocked_resources> types (image, font, stylesheet, media), nor the <browser_blocked_urls> (wildcard
+# patterns, e.g., analytics and ads), and stops waiting once the DOM is parsed ("eager" <browser_page_load_strategy>; the scrapers still wait
+# for their content, see crawler/readiness.py). A page that takes longer than <browser_page_load_timeout> seconds to load is stopped and
+# scraped as is. Set <browser_lean> to False for Chrome's default profile.
+# TODO: [Update as required] e.g., unblock "stylesheet" if a publisher's page only renders its content once its CSS is loaded.
+browser_lean = True
+browser_page_load_strategy = "eager"
+browser_page_load_timeout = 30
+browser_blocked_resources = ["image", "font", "stylesheet", "media"]
+browser_blocked_urls = [
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*googlesyndication.com*",
+    "*doubleclick.net*",
+    "*adservice.google.com*",
+    "*facebook.net*",
+    "*hotjar.com*",
+    "*newrelic.com*",
+    "*nr-data.net*",
+    "*scholar.google.com/scholar_js*",
+    "*altmetric.com*",
+    "*crossmark*",
+    "*addthis.com*",
+    "*cookielaw.org*",
+]
+
+# Lifecycle of each headless Chrome (see <DriverManager> in crawler/driver.py): it is quit and replaced by a fresh one after
+# <driver_max_pages> papers, or once its processes use more than <driver_max_rss_mb> MiB (None: no limit). A paper that takes more than
+# <driver_hang_timeout> seconds is considered hung: the browser is killed and replaced, and the paper retried up to <driver_hang_retries> times.
+driver_max_pages = 500
+driver_max_rss_mb = 2048
+driver_hang_timeout = 180
+driver_hang_retries = 1
+
+# How the pages of each publisher are fetched: "http" (plain, pooled keep-alive async HTTP client; for static pages) or "browser"
+# (headless Chrome; for pages rendered with JavaScript, e.g., IEEE Xplore). Publishers that are not listed use the browser.
+# A paper is fetched over HTTP only if ALL the publishers of its venue are "http".
+publisher_fetch = {
+    "aaai": "http",
+    "cogsci": "http",
+    "dagstuhl": "http",
+    "eurographics_digital_library": "http",
+    "graphics_interface_proceedings": "http",
+    "scitepress": "http",
+}
+http_concurrency = 64
+http_concurrency_per_host = 8
+http_timeout = 30
+http_batch_size = 500
+http_user_agent = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36"
+
+# Take the fields that publishers embed as machine-readable metadata in their pages (citation_*/dc.* <meta> tags, JSON-LD, IEEE Xplore's
+# metadata blob; see scrapers/metadata.py and "metadata" in scrapers/registry.py) from there, and only parse the page for the rest.
+# IEEE Xplore's blob is in the raw html: with it, "ieee_explore" can be fetched with "http" above (if Xplore lets the HTTP client through).
+embedded_metadata = True
+
+# Run the extractors of the publishers that have an in-page (JavaScript) version (see "in_page" in scrapers/registry.py) inside the browser
+# with ONE execute_script call per page, instead of transferring the whole page_source to Python and parsing it there. Those pages are then
+# NOT stored in the html cache (see <cache_html>), unless another field needs their html. See benchmark-in-page.py to compare both.
+in_page_extraction = False
+# benchmark-in-page.py: number of papers (of venues with in-page extractors) to benchmark, unless URLs are given on the command line.
+benchmark_papers = 20
+
+# 3-update.py: a field that failed ("Error") is classified (see crawler/errors.py) and, if the error is transient, retried by a later run
+# after an exponential backoff: <retry_backoff>[error class] seconds after the first failure, then twice as long after every other one
+# (at most <retry_backoff_max>), and at most <retry_max_attempts> times. Permanent errors (http_4xx) are not retried.
+# TODO: [Update as required] e.g., clear the `<field>_error` columns to retry every failed field on the next run.
+retry_backoff = {
+    "timeout": 60 * 60,
+    "network": 60 * 60,
+    "rate_limited": 6 * 60 * 60,
+    "http_5xx": 6 * 60 * 60,
+    "parse_miss": 7 * 24 * 60 * 60,
+}
+retry_backoff_max = 90 * 24 * 60 * 60
+retry_max_attempts = 5
+
+# 3-update.py: rough time (in seconds) that ONE paper takes to fetch and scrape, over HTTP or with the browser, for the estimated duration
+# of a run (see crawler/plan.py).
+seconds_per_page = {
+    "http": 1.0,
+    "browser": 8.0,
+}
+
+# 3-update.py: the results are journaled to <path_journal> (and fsync-ed every <journal_flush_rows> papers) while scraping. After a crash or
+# Ctrl-C, re-running 3-update.py replays the journal and skips the papers in it. It is removed once the results are in <path_output>.
+path_journal = os.path.join("..", "output", "update_journal.jsonl")
+journal_flush_rows = 25
+
+# 3-update.py: keep every fetched page in a compressed on-disk cache at <path_html_cache> (see crawler/cache.py), up to
+# <html_cache_max_bytes> (the least recently used pages are evicted beyond that).
+cache_html = True
+path_html_cache = os.path.join("..", "output", "html_cache")
+html_cache_max_bytes = 20 * 1024 * 1024 * 1024
+
+# 3-update.py: instead of scraping, re-run the extractors (e.g., after fixing one in scrapers/) over the cached pages of ALL the papers
+# of the <__publication_src>, on <reextract_workers> processes and without any network access. Only successful extractions are written.
+reextract_from_cache = False
+reextract_workers = os.cpu_count() or 1
+
+# Maximum time (in seconds) to wait for a publisher's page to render the content the scrapers look for (see crawler/readiness.py).
+page_ready_timeout = 10
+keywords_page_ready_timeout = 5
+
+# 3-update.py: per-host scheduling (see crawler/scheduler.py). Every host gets a token bucket of <host_rate> requests per second (bursts
+# of <host_burst>), or <host_rates>[host]. Its concurrency starts at <host_initial_concurrency> and adapts between 1 and
+# <host_max_concurrency>: it grows while responses are faster than <host_target_latency> seconds and shrinks otherwise. A 429/503 halves
+# the host's concurrency and rate and pauses it for <host_cooldown> seconds.
+host_rate = 1.0
+host_burst = 2
+host_initial_concurrency = 2
+host_max_concurrency = 8
+host_target_latency = 10.0
+host_cooldown = 30.0
+# TODO: [Update as required] Requests per second for hosts that need to be treated more gently (or can take more).
+host_rates = {
+    "ieeexplore.ieee.org": 0.5,
+    "dl.acm.org": 0.5,
+    "link.springer.com": 1.0,
+    "onlinelibrary.wiley.com": 0.5,
+    "diglib.eg.org": 2.0,
+}
+# DBLP links to most papers through doi.org. The scheduler attributes such links to the publisher's host by their DOI prefix.
+doi_prefix_hosts = {
+    "10.1109": "ieeexplore.ieee.org",
+    "10.1145": "dl.acm.org",
+    "10.1007": "link.springer.com",
+    "10.1111": "onlinelibrary.wiley.com",
+    "10.1002": "onlinelibrary.wiley.com",
+    "10.2312": "diglib.eg.org",
+    "10.5220": "scitepress.org",
+    "10.4230": "drops.dagstuhl.de",
+    "10.1609": "ojs.aaai.org",
+    "10.20380": "graphicsinterface.org",
+}
+# Titles of the error pages that show that a host is throttling the browser, mapped to the status they stand for. Only used when the browser
+# does not report the page's HTTP status (see crawler/fetchers.py), and only matched at the START of the title (case-insensitive).
+throttled_page_titles = {
+    "429": 429,
+    "Too Many Requests": 429,
+    "503": 503,
+    "Service Unavailable": 503,
+}
+
 # List of Venues we target with their DBLP category. This information can be found in the <path_unique_venues> path above.
 # TODO: [Update as required] Don't forget to add the corresponding logic to scrape keywords/absracts/titles/citations, etc.
 interesting_venues = {
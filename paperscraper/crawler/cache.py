@@ -0,0 +1,99 @@
+# External packages
+import hashlib
+import sqlite3
+import time
+import gzip
+import os
+
+# Internal modules
+import config
+
+
+# On-disk cache of every fetched page, so that fixed extractors (see scrapers/) can be re-run without fetching anything again.
+# - The pages are stored gzipped under the SHA-1 of their html (content-addressed: identical pages are stored once) in <root>/objects/.
+# - <root>/index.sqlite records every fetch: the requested URL, when it was fetched, the final URL (after redirects) and the page's digest.
+#   A lookup returns the latest fetch of a URL.
+# - Once the pages exceed <max_bytes>, the least recently used ones are evicted.
+# It is safe to use from several processes at once (e.g., the workers of crawler/pool.py), each with its own instance.
+class HtmlCache:
+    def __init__(self, root, max_bytes, compresslevel=6):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.compresslevel = compresslevel
+        self.puts = 0
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        self.db = sqlite3.connect(os.path.join(root, "index.sqlite"), timeout=60)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS pages (url TEXT, fetched_at REAL, final_url TEXT, digest TEXT)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS pages_url ON pages (url, fetched_at)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS blobs (digest TEXT PRIMARY KEY, size INTEGER, last_access REAL)")
+        self.db.commit()
+
+    def _blob_path(self, digest):
+        return os.path.join(self.root, "objects", digest[:2], digest + ".html.gz")
+
+    # Store the page fetched from <url> (which ended up at <final_url>).
+    def put(self, url, final_url, html):
+        data = html.encode("utf-8")
+        digest = hashlib.sha1(data).hexdigest()
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            path_tmp = path + "." + str(os.getpid()) + ".tmp"
+            with gzip.open(path_tmp, "wb", compresslevel=self.compresslevel) as f:
+                f.write(data)
+            os.replace(path_tmp, path)
+        now = time.time()
+        with self.db:
+            self.db.execute("INSERT INTO blobs VALUES (?, ?, ?) ON CONFLICT(digest) DO UPDATE SET last_access = excluded.last_access",
+                            (digest, os.path.getsize(path), now))
+            self.db.execute("INSERT INTO pages VALUES (?, ?, ?, ?)", (url, now, final_url, digest))
+        self.puts += 1
+        if self.puts % 100 == 0:
+            self.evict()
+
+    # The latest fetch of <url> as (final url, html), or None if it is not cached.
+    def get(self, url):
+        row = self.db.execute("SELECT final_url, digest FROM pages WHERE url = ? ORDER BY fetched_at DESC LIMIT 1", (url,)).fetchone()
+        if row is None:
+            return None
+        final_url, digest = row
+        try:
+            with gzip.open(self._blob_path(digest), "rb") as f:
+                html = f.read().decode("utf-8")
+        except FileNotFoundError:
+            # Evicted by another process in the meantime.
+            return None
+        with self.db:
+            self.db.execute("UPDATE blobs SET last_access = ? WHERE digest = ?", (time.time(), digest))
+        return final_url, html
+
+    # Drop the least recently used pages until the cache fits in <max_bytes> again.
+    def evict(self):
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = list()
+        for digest, size in self.db.execute("SELECT digest, size FROM blobs ORDER BY last_access").fetchall():
+            if total <= self.max_bytes:
+                break
+            evicted.append(digest)
+            total -= size
+        with self.db:
+            self.db.executemany("DELETE FROM pages WHERE digest = ?", [(digest,) for digest in evicted])
+            self.db.executemany("DELETE FROM blobs WHERE digest = ?", [(digest,) for digest in evicted])
+        for digest in evicted:
+            try:
+                os.remove(self._blob_path(digest))
+            except FileNotFoundError:
+                pass
+
+    def close(self):
+        self.db.close()
+
+
+# The cache at <config.path_html_cache>, or None if caching is disabled.
+def open_cache():
+    if not config.cache_html:
+        return None
+    return HtmlCache(config.path_html_cache, config.html_cache_max_bytes)
@@ -0,0 +1,168 @@
+# External packages
+from contextlib import contextmanager
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+import psutil
+import threading
+
+# Internal modules
+import config
+
+
+# URL patterns (for the DevTools' Network.setBlockedURLs) of each type of resource that the lean profile can block (see <config.browser_lean>).
+resource_patterns = {
+    "image": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.bmp", "*.avif"],
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "stylesheet": ["*.css", "*.css?*"],
+    "media": ["*.mp4", "*.webm", "*.mp3", "*.ogg", "*.m3u8"],
+}
+
+# Chrome content settings (2 = block) of the resource types that have one: blocks them even if their URL has no telling extension.
+resource_content_settings = {
+    "image": "profile.managed_default_content_settings.images",
+}
+
+# Chrome features that headless scraping never uses.
+lean_arguments = [
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-extensions",
+    "--disable-features=Translate,MediaRouter,OptimizationHints,InterestFeedContentSuggestions",
+    "--disable-gpu",
+    "--disable-notifications",
+    "--disable-sync",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--no-default-browser-check",
+    "--no-first-run",
+]
+
+
+def _blocked_urls():
+    return [pattern for resource in config.browser_blocked_resources for pattern in resource_patterns.get(resource, [])] + list(config.browser_blocked_urls)
+
+
+# get a new headless Chrome driver
+def get_webdriver_instance():
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    if config.browser_lean:
+        chrome_options.page_load_strategy = config.browser_page_load_strategy
+        for argument in lean_arguments:
+            chrome_options.add_argument(argument)
+        if "image" in config.browser_blocked_resources:
+            chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_experimental_option("prefs", {resource_content_settings[resource]: 2 for resource in config.browser_blocked_resources if resource in resource_content_settings})
+    chrome_options.binary_location = config.path_chromeoptions_binary
+    service = Service(executable_path=config.path_chromedriver)
+    driver = webdriver.Chrome(service=service, options=chrome_options)
+    if config.browser_lean:
+        # Block the requests in the browser itself, through the DevTools protocol.
+        driver.execute_cdp_cmd("Network.enable", dict())
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": _blocked_urls()})
+    driver.set_page_load_timeout(config.browser_page_load_timeout)
+    # driver.implicitly_wait(10000)
+    return driver
+
+
+# Owns the headless Chrome of ONE process for a whole run, and keeps it healthy:
+# - recycles it (quits it and starts a fresh one) after <max_pages> papers, or once the browser's processes use more than <max_rss> bytes,
+# - kills it if a paper takes more than <hang_timeout> seconds (see <watch>): the hung WebDriver call then fails, and the caller can retry.
+class DriverManager:
+    def __init__(self, max_pages, max_rss, hang_timeout):
+        self.max_pages = max_pages
+        self.max_rss = max_rss
+        self.hang_timeout = hang_timeout
+        self.driver = None
+        self.pages = 0
+        self.hung = False
+        self.recycles = 0
+
+    # The current driver, started if there is none (yet, or since the last recycle).
+    def get(self):
+        if self.driver is None:
+            self.driver = get_webdriver_instance()
+            self.pages = 0
+            self.hung = False
+        return self.driver
+
+    # The chromedriver and all the Chrome processes it started.
+    def _processes(self):
+        try:
+            process = psutil.Process(self.driver.service.process.pid)
+            return [process] + process.children(recursive=True)
+        except (psutil.Error, AttributeError):
+            return list()
+
+    # Resident memory (in bytes) of the browser.
+    def rss(self):
+        total = 0
+        for process in self._processes():
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+
+    # Watchdog over ONE paper: if it is not done within <hang_timeout> seconds, the browser is killed and <hung> is set.
+    @contextmanager
+    def watch(self):
+        timer = threading.Timer(self.hang_timeout, self._on_hang)
+        timer.daemon = True
+        timer.start()
+        try:
+            yield
+        finally:
+            timer.cancel()
+
+    def _on_hang(self):
+        self.hung = True
+        print("[Driver] No answer for " + str(self.hang_timeout) + " seconds: killing the browser.")
+        self.kill()
+
+    # Count a paper served by the current driver, and recycle the driver if it reached a threshold.
+    def served(self):
+        self.pages += 1
+        if self.pages >= self.max_pages:
+            self.recycle("served " + str(self.pages) + " papers")
+        elif self.max_rss is not None:
+            rss = self.rss()
+            if rss > self.max_rss:
+                self.recycle("uses " + str(rss // (1024 * 1024)) + " MiB")
+
+    def recycle(self, reason):
+        print("[Driver] Recycling the browser: " + reason + ".")
+        self.recycles += 1
+        self.quit()
+
+    # Kill the browser without asking it (e.g., when it hangs). The next <get> starts a new one.
+    def kill(self):
+        for process in reversed(self._processes()):
+            try:
+                process.kill()
+            except psutil.Error:
+                pass
+
+    def quit(self):
+        if self.driver is None:
+            return
+        processes = self._processes()
+        try:
+            self.driver.quit()
+        except Exception as e:
+            pass
+        # Chrome sometimes leaves (renderer) processes behind.
+        gone, alive = psutil.wait_procs(processes, timeout=5)
+        for process in alive:
+            try:
+                process.kill()
+            except psutil.Error:
+                pass
+        self.driver = None
+
+
+def new_driver_manager():
+    max_rss = config.driver_max_rss_mb * 1024 * 1024 if config.driver_max_rss_mb is not None else None
+    return DriverManager(config.driver_max_pages, max_rss, config.driver_hang_timeout)
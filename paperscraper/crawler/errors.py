@@ -0,0 +1,129 @@
+# External packages
+from selenium.common.exceptions import TimeoutException
+import asyncio
+import math
+import pandas as pd
+import time
+
+# Internal modules
+from crawler.scheduler import throttle_statuses
+from dblp.ingest import scraped_fields
+import config
+
+
+# Why a field could not be scraped. Stored in the `<field>_error` column next to the field (which holds "Error"), along with
+# `<field>_attempts` (failed attempts in a row) and `<field>_retry_at` (epoch seconds from which it may be scraped again; None: never).
+timeout = "timeout"              # The page did not load in time.
+network = "network"              # Any other failure to fetch the page (DNS, connection refused or reset, browser errors, ...).
+rate_limited = "rate_limited"    # The host throttled us (see <throttle_statuses> in crawler/scheduler.py).
+http_4xx = "http_4xx"            # Not found, forbidden, ...
+http_5xx = "http_5xx"            # The host failed.
+parse_miss = "parse_miss"        # The page loaded, but the extractors (see scrapers/) did not find the field on it.
+unsupported = "unsupported"      # None of the venue's publishers provide the field (see scrapers/registry.py): only counted, never stored.
+
+error_classes = [timeout, network, rate_limited, http_4xx, http_5xx, parse_miss, unsupported]
+
+# Suffixes of the bookkeeping columns of a field (see dblp/diff.py: they are carried over with the field).
+bookkeeping_suffixes = ["_error", "_attempts", "_retry_at"]
+
+
+def bookkeeping_columns(field):
+    return [field + suffix for suffix in bookkeeping_suffixes]
+
+
+class HTTPStatusError(Exception):
+    def __init__(self, url, status):
+        super().__init__("HTTP " + str(status) + ": " + str(url))
+        self.url = url
+        self.status = status
+
+
+# The error class of an exception raised while fetching a page.
+def classify(exception):
+    if isinstance(exception, HTTPStatusError):
+        if exception.status in throttle_statuses:
+            return rate_limited
+        return http_5xx if exception.status >= 500 else http_4xx
+    if isinstance(exception, (TimeoutError, asyncio.TimeoutError, TimeoutException)):
+        return timeout
+    return network
+
+
+# Transient errors are retried after an exponential backoff (see <config.retry_backoff>); the others are permanent.
+def is_transient(error_class):
+    return error_class in config.retry_backoff
+
+
+def _number(value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(value) else value
+
+
+def _error_of(row, field):
+    value = row.get(field + "_error")
+    return value if isinstance(value, str) else None
+
+
+# Whether <field> of <row> may be scraped at <now> (epoch seconds): always, unless an earlier attempt failed and is not due for a retry yet.
+# Rows that failed before errors were classified (no `<field>_error`) are due, and so are the fields marked unsupported by earlier runs
+# (that follows from the registry, see scrapers/registry.py, which may have changed since).
+def is_due(row, field, now=None):
+    if _error_of(row, field) in (None, unsupported):
+        return True
+    retry_at = _number(row.get(field + "_retry_at"))
+    return retry_at is not None and retry_at <= (now if now is not None else time.time())
+
+
+# Same as <is_due>, for every row of <df_papers> at once.
+def due_mask(df_papers, field, now):
+    if field + "_error" not in df_papers.columns:
+        return pd.Series(True, index=df_papers.index)
+    failed = df_papers[field + "_error"].notna() & (df_papers[field + "_error"] != unsupported)
+    if field + "_retry_at" not in df_papers.columns:
+        return ~failed
+    retry_at = pd.to_numeric(df_papers[field + "_retry_at"], errors="coerce")
+    return ~failed | (retry_at <= now)
+
+
+# Bookkeeping columns of a failed attempt at <field> of <row>: the <error_class>, one more attempt, and when to retry (exponential backoff
+# from <config.retry_backoff>; None for permanent errors or after <config.retry_max_attempts> attempts).
+def failure_updates(row, field, error_class, now=None):
+    now = now if now is not None else time.time()
+    attempts = int(_number(row.get(field + "_attempts")) or 0) + 1
+    retry_at = None
+    if is_transient(error_class) and attempts < config.retry_max_attempts:
+        retry_at = now + min(config.retry_backoff[error_class] * 2 ** (attempts - 1), config.retry_backoff_max)
+    return {field + "_error": error_class, field + "_attempts": attempts, field + "_retry_at": retry_at}
+
+
+# Bookkeeping columns of a successful attempt at <field> of <row> (cleared, if it had failed before).
+def success_updates(row, field):
+    if _error_of(row, field) is None:
+        return dict()
+    return {field + "_error": None, field + "_attempts": 0, field + "_retry_at": None}
+
+
+# The retry queue of <df_papers>: how many failed fields (per error class) wait for a retry, when the first one is due, and how many are
+# given up on (permanent errors, or too many attempts).
+def retry_queue_summary(df_papers, now=None):
+    now = now if now is not None else time.time()
+    waiting = dict()
+    given_up = dict()
+    next_due = None
+    for field in scraped_fields:
+        if field + "_error" not in df_papers.columns:
+            continue
+        error = df_papers[field + "_error"]
+        retry_at = pd.to_numeric(df_papers[field + "_retry_at"], errors="coerce") if field + "_retry_at" in df_papers.columns else pd.Series(float("nan"), index=df_papers.index)
+        failed = error.notna() & (df_papers[field] == "Error")
+        for error_class, count in error[failed & (retry_at > now)].value_counts().items():
+            waiting[error_class] = waiting.get(error_class, 0) + int(count)
+        for error_class, count in error[failed & retry_at.isna()].value_counts().items():
+            given_up[error_class] = given_up.get(error_class, 0) + int(count)
+        if (failed & (retry_at > now)).any():
+            due = retry_at[failed & (retry_at > now)].min()
+            next_due = due if next_due is None else min(next_due, due)
+    return waiting, given_up, next_due
@@ -0,0 +1,104 @@
+# External packages
+from selenium.common.exceptions import TimeoutException
+import time
+
+# Internal modules
+from crawler.errors import HTTPStatusError
+from crawler.readiness import wait_until_ready
+from scrapers.in_page import extract_in_page
+import config
+
+
+# HTTP status of the page's main document (0 or undefined if the browser does not report it).
+navigation_status_script = "var entry = performance.getEntriesByType('navigation')[0]; return entry ? entry.responseStatus : null;"
+
+
+# Fetches pages with a (headless Chrome) webdriver, for publishers that render their content with JavaScript.
+# Every page is also stored in <cache> (see crawler/cache.py), unless it is None.
+class BrowserFetcher:
+    def __init__(self, driver, cache=None):
+        self.driver = driver
+        self.cache = cache
+        self.url = None
+        self.status = None
+        # (seconds, status) of every page fetched since the last <pop_fetches>, for the scheduler (see crawler/scheduler.py).
+        self.fetches = list()
+
+    def get(self, url, publishers, timeout, selectors=None):
+        self.load(url, publishers, timeout, selectors=selectors)
+        return self.source()
+
+    # Navigate to <url> and wait for the content of the <publishers>, WITHOUT transferring the page to Python (see <source>, <extract_in_page>).
+    def load(self, url, publishers, timeout, selectors=None):
+        started = time.monotonic()
+        self.url = url
+        self.status = None
+        try:
+            try:
+                self.driver.get(url)
+            except TimeoutException:
+                # Took longer than <config.browser_page_load_timeout> (see crawler/driver.py): stop loading, the content may be there already.
+                self.driver.execute_script("window.stop();")
+
+            # Wait until routings are complete and the content the scrapers look for has rendered (capped at <timeout>)
+            wait_until_ready(self.driver, publishers, timeout, selectors=selectors)
+
+            # Pages that the host answered with an error are failures, classified as over HTTP (see crawler/errors.py).
+            self.status = self._error_status()
+            if self.status is not None:
+                raise HTTPStatusError(url, self.status)
+        finally:
+            self.fetches.append((time.monotonic() - started, self.status))
+
+    # The error status (>= 400) of the loaded page, or None. Taken from the HTTP status of the main document (Navigation Timing's
+    # responseStatus); if the browser does not report it, from the title of the error page a throttling host sent (see
+    # <config.throttled_page_titles>), which must START with one of the markers: a paper's own title may well contain "503".
+    def _error_status(self):
+        try:
+            status = self.driver.execute_script(navigation_status_script)
+        except Exception:
+            status = None
+        if status:
+            status = int(status)
+            return status if status >= 400 else None
+        title = (self.driver.title or "").strip().lower()
+        for marker, marker_status in config.throttled_page_titles.items():
+            if title.startswith(marker.lower()):
+                return marker_status
+        return None
+
+    # The html of the loaded page (pulled over the WebDriver wire).
+    def source(self):
+        page_source = self.driver.page_source
+        if self.cache is not None and self.status is None:
+            self.cache.put(self.url, self.driver.current_url, page_source)
+        return page_source
+
+    # Run the in-page <extractors> (field -> JavaScript, see scrapers/in_page.py) of the <fields> in the loaded page. Returns field -> value.
+    def extract_in_page(self, extractors, fields):
+        return extract_in_page(self.driver, extractors, fields)
+
+    def pop_fetches(self):
+        fetches, self.fetches = self.fetches, list()
+        return fetches
+
+    @property
+    def current_url(self):
+        return self.driver.current_url
+
+
+# Serves pages that have already been fetched (e.g., over plain HTTP, see crawler/http.py) from <pages>: url -> (final url, html).
+# <pages> can also be the on-disk cache (see crawler/cache.py).
+class PrefetchedFetcher:
+    def __init__(self, pages):
+        self.pages = pages
+        self.current_url = None
+
+    def get(self, url, publishers, timeout, selectors=None):
+        page = self.pages.get(url)
+        if page is None:
+            raise LookupError("Not fetched: " + str(url))
+        if isinstance(page, Exception):
+            raise page
+        self.current_url, html = page
+        return html
@@ -0,0 +1,108 @@
+# External packages
+import aiohttp
+import asyncio
+import time
+
+# Internal modules
+from crawler.cache import open_cache
+from crawler.errors import HTTPStatusError
+from crawler.fetchers import PrefetchedFetcher
+from crawler.worker import fields_to_scrape, keywords_url, paper_urls, scrape_paper, task_url
+from scrapers.extract import keywords_pages, metadata_fields
+from scrapers.metadata import extract_metadata
+from scrapers.registry import resolve
+import config
+
+
+# A paper can be fetched over plain HTTP if ALL the publishers of its venue serve static pages (see <config.publisher_fetch>).
+def is_static(row):
+    publishers = config.interesting_venues[row["source"]]["publishers"]
+    return all(config.publisher_fetch.get(publisher, "browser") == "http" for publisher in publishers)
+
+
+# Fetch <url> as soon as the <scheduler> lets its host take another request, and report back how long it took and how it answered.
+async def _fetch(session, scheduler, url):
+    host = scheduler.host_of(url)
+    while not scheduler.try_start(host):
+        await asyncio.sleep(max(scheduler.wait_time(host), 0.05))
+    started = time.monotonic()
+    status = None
+    try:
+        async with session.get(url, allow_redirects=True) as response:
+            status = response.status
+            if response.status >= 400:
+                return url, HTTPStatusError(url, response.status)
+            return url, (str(response.url), await response.text(errors="replace"))
+    except Exception as e:
+        return url, e
+    finally:
+        scheduler.finish(host, time.monotonic() - started, status)
+
+
+async def _fetch_all(session, scheduler, urls):
+    return dict(await asyncio.gather(*(_fetch(session, scheduler, url) for url in urls)))
+
+
+# Fetch the landing pages of a batch of papers and then the extra pages that some publishers need for the keywords, all concurrently.
+# Returns url -> (final url, html), or the exception that the fetch raised.
+async def _prefetch(session, scheduler, tasks, scraper_filter):
+    landing_urls = set()
+    for index, row in tasks:
+        urls = paper_urls(row)
+        if len(urls) > 0 and not urls[0].startswith("db/") and len(fields_to_scrape(row, scraper_filter)) > 0:
+            landing_urls.add(urls[0])
+    pages = await _fetch_all(session, scheduler, landing_urls)
+
+    # Redirects: the keywords are looked up relative to the final URL of the landing page.
+    for page in list(pages.values()):
+        if not isinstance(page, Exception):
+            pages[page[0]] = page
+
+    keyword_urls = set()
+    for index, row in tasks:
+        urls = paper_urls(row)
+        page = pages.get(urls[0]) if len(urls) > 0 else None
+        if page is not None and not isinstance(page, Exception) and "keywords" in fields_to_scrape(row, scraper_filter):
+            for publisher in resolve(page[0], config.interesting_venues[row["source"]]["publishers"]):
+                # No need for the keywords page if the landing page embeds them (see scrapers/metadata.py).
+                if config.embedded_metadata and len(metadata_fields(publisher, ["keywords"])) > 0 and "keywords" in extract_metadata(page[1]):
+                    break
+                if publisher in keywords_pages:
+                    keyword_urls.add(keywords_url(publisher, page[0]))
+    pages.update(await _fetch_all(session, scheduler, keyword_urls - set(pages)))
+    return pages
+
+
+async def _open_session():
+    connector = aiohttp.TCPConnector(limit=config.http_concurrency, limit_per_host=config.http_concurrency_per_host, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=config.http_timeout)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout, headers={"User-Agent": config.http_user_agent})
+
+
+# Scrape the <tasks> ((index, row) pairs) of static publishers over ONE pooled, keep-alive HTTP session instead of a browser.
+# Pages are fetched concurrently in batches of <config.http_batch_size> papers and then handed to the same scrapers as the browser's.
+# The papers are interleaved across hosts, each of which the <scheduler> keeps within its limits (see crawler/scheduler.py).
+# Yields (index, source, updates, log) like crawler/pool.py.
+def scrape_static(tasks, scraper_filter, scheduler):
+    if len(tasks) == 0:
+        return
+    tasks = scheduler.interleave(tasks, task_url)
+    loop = asyncio.new_event_loop()
+    session = loop.run_until_complete(_open_session())
+    cache = open_cache()
+    try:
+        for start in range(0, len(tasks), config.http_batch_size):
+            batch = tasks[start:start + config.http_batch_size]
+            pages = loop.run_until_complete(_prefetch(session, scheduler, batch, scraper_filter))
+            if cache is not None:
+                for url, page in pages.items():
+                    if not isinstance(page, Exception):
+                        cache.put(url, page[0], page[1])
+            for index, row in batch:
+                updates, log = scrape_paper(PrefetchedFetcher(pages), index, row, scraper_filter)
+                yield index, row["source"], updates, log
+    finally:
+        if cache is not None:
+            cache.close()
+        loop.run_until_complete(session.close())
+        loop.close()
@@ -0,0 +1,65 @@
+# External packages
+import json
+import os
+
+
+# Append-only journal of the results of 3-update.py, so that a crash, OOM or Ctrl-C does not lose the rows scraped so far.
+# Every row is one JSON line ({"id", "source", "updates", "log"}), fsync-ed to disk every <flush_rows> rows. The journal is replayed
+# (and its rows skipped) on restart, and removed once its results have been written to the papers table.
+class ResultsJournal:
+    def __init__(self, path, flush_rows):
+        self.path = path
+        self.flush_rows = flush_rows
+        self.pending = 0
+        self.f = None
+
+    # The journaled rows of an earlier, interrupted run.
+    def load(self):
+        if not os.path.exists(self.path):
+            return list()
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            # Drop a last line that a crash cut off, so that new rows start on a line of their own.
+            end = data.rfind(b"\n") + 1
+            if end < len(data):
+                f.truncate(end)
+        entries = list()
+        for line in data[:end].splitlines():
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                pass
+        return entries
+
+    def append(self, row_id, source, updates, log):
+        if self.f is None:
+            self.f = open(self.path, "a", encoding="utf-8")
+        self.f.write(json.dumps({"id": row_id, "source": source, "updates": updates, "log": log}, default=str) + "\n")
+        self.pending += 1
+        if self.pending >= self.flush_rows:
+            self.flush()
+
+    def flush(self):
+        if self.f is not None:
+            self.f.flush()
+            os.fsync(self.f.fileno())
+        self.pending = 0
+
+    def close(self):
+        if self.f is not None:
+            self.flush()
+            self.f.close()
+            self.f = None
+
+    # The results are in the papers table now.
+    def remove(self):
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+# Stable ids of the rows of the papers table <df> for the journal: their DBLP `key` (or their index, for tables without one).
+def row_ids(df):
+    if "key" in df.columns:
+        return dict(zip(df.index, df["key"].map(str)))
+    return {index: str(index) for index in df.index}
@@ -0,0 +1,53 @@
+# External packages
+import multiprocessing
+
+# Internal modules
+from crawler.cache import HtmlCache
+from crawler.errors import bookkeeping_columns, success_updates
+from crawler.fetchers import PrefetchedFetcher
+from crawler.worker import scrape_paper
+from dblp.ingest import scraped_fields
+import config
+
+
+# Re-run the extractors of every field, whatever the row holds now.
+reextract_filter = {field: ["Not Scraped"] for field in scraped_fields}
+
+# Per-process cache (see <_init_worker>).
+_cache = None
+
+
+def _init_worker():
+    global _cache
+    _cache = HtmlCache(config.path_html_cache, config.html_cache_max_bytes)
+
+
+def _reextract(task):
+    index, original_row = task
+    # Every field, even those that wait for a retry (see crawler/errors.py).
+    row = dict(original_row, **{field: "Not Scraped" for field in scraped_fields})
+    for field in scraped_fields:
+        for column in bookkeeping_columns(field):
+            row.pop(column, None)
+    updates, log = scrape_paper(PrefetchedFetcher(_cache), index, row, reextract_filter)
+
+    # Without the network, a failed extraction (e.g., a page that was never cached) says nothing about the paper: keep what the table holds,
+    # including why it failed before.
+    failed = [field for field in scraped_fields if updates.get(field) in ("Error", "No Url")]
+    updates = {column: value for column, value in updates.items() if not any(column == field or column in bookkeeping_columns(field) for field in failed)}
+    for field in scraped_fields:
+        if field in updates and field not in failed:
+            updates.update(success_updates(original_row, field))
+    return index, row["source"], updates, log
+
+
+# Re-run the extractors (see scrapers/) over the cached pages of the <tasks> ((index, row) pairs) on <workers> processes, with no network.
+# Yields (index, source, updates, log) like crawler/pool.py, as the rows complete.
+def run_offline(tasks, workers):
+    if workers <= 1:
+        _init_worker()
+        yield from map(_reextract, tasks)
+        return
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(workers, initializer=_init_worker) as pool:
+        yield from pool.imap_unordered(_reextract, tasks, chunksize=64)
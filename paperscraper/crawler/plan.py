@@ -0,0 +1,75 @@
+# External packages
+import numpy as np
+import pandas as pd
+
+# Internal modules
+from crawler.errors import due_mask
+from dblp.ingest import scraped_fields
+import config
+
+
+# Rows of <df_papers> to scrape, computed on whole columns at once instead of row by row: those of the <sources> (venues) with at least one
+# field whose state is in the <scraper_filter> and that is due (see crawler/errors.py), minus the <skip_indices> (e.g., the rows already in
+# the journal, see crawler/journal.py). With <every_row>, all the rows of the <sources> (minus <skip_indices>) are selected, whatever their
+# state. Returns their indices, by priority (see <prioritize>).
+def select_work(df_papers, scraper_filter, sources, skip_indices, now, every_row=False):
+    mask = df_papers["source"].isin(sources)
+    if len(skip_indices) > 0:
+        mask &= ~df_papers.index.isin(list(skip_indices))
+    missing = pd.Series(0, index=df_papers.index)
+    for field in scraped_fields:
+        missing += (df_papers[field].isin(scraper_filter[field]) & due_mask(df_papers, field, now)).astype(int)
+    if not every_row:
+        mask &= missing > 0
+    return prioritize(df_papers[mask], missing[mask])
+
+
+# Write the <updates> (index -> column -> value, e.g., the results of a run and of its journal) into <df_papers>, one column at a time instead of
+# cell by cell. New columns (e.g., the bookkeeping columns of crawler/errors.py) are added. Lists (keywords) stay single cells, and the other
+# columns keep their type (e.g., None becomes NaN in a numeric column).
+def apply_updates(df_papers, updates):
+    columns = dict()
+    for index, row_updates in updates.items():
+        for column, value in row_updates.items():
+            columns.setdefault(column, dict())[index] = value
+    for column, values in columns.items():
+        if column not in df_papers.columns:
+            df_papers[column] = pd.Series(None, index=df_papers.index, dtype=object)
+        new_values = np.empty(len(values), dtype=object)
+        for position, value in enumerate(values.values()):
+            new_values[position] = value
+        column_values = df_papers[column].to_numpy(dtype=object, copy=True)
+        column_values[df_papers.index.get_indexer(list(values))] = new_values
+        merged = pd.Series(column_values, index=df_papers.index, dtype=object)
+        df_papers[column] = merged if df_papers[column].dtype == object else merged.infer_objects()
+
+
+# Order of the work list: the papers with the most fields to scrape first, then the most recent ones, then in the order of the venues in
+# <config.interesting_venues>.
+def prioritize(df_work, missing):
+    venue_order = {venue: order for order, venue in enumerate(config.interesting_venues)}
+    keys = pd.DataFrame({
+        "missing": missing,
+        "year": pd.to_numeric(df_work["year"], errors="coerce").fillna(0) if "year" in df_work.columns else 0,
+        "venue": df_work["source"].astype(object).map(venue_order).fillna(len(venue_order)),
+    }, index=df_work.index)
+    return keys.sort_values(["missing", "year", "venue"], ascending=[False, False, True], kind="stable").index.tolist()
+
+
+# Estimated duration (in seconds) of a run over <http_tasks> and <browser_tasks>: the slower of the per-page cost (<config.seconds_per_page>
+# spread over the parallel fetches) and the rate limit of the busiest host (see crawler/scheduler.py).
+def estimate_seconds(http_tasks, browser_tasks, scheduler, url_of):
+    by_cost = len(http_tasks) * config.seconds_per_page["http"] / max(config.http_concurrency, 1) + \
+        len(browser_tasks) * config.seconds_per_page["browser"] / max(config.scraper_workers, 1)
+    per_host = dict()
+    for task in http_tasks + browser_tasks:
+        host = scheduler.host_of(url_of(task))
+        per_host[host] = per_host.get(host, 0) + 1
+    by_rate = max((count / scheduler.host_rate(host) for host, count in per_host.items()), default=0)
+    return max(by_cost, by_rate)
+
+
+def format_duration(seconds):
+    hours, seconds = divmod(int(seconds), 3600)
+    minutes, seconds = divmod(seconds, 60)
+    return str(hours) + "h " + str(minutes).zfill(2) + "m " + str(seconds).zfill(2) + "s"
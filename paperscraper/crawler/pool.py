@@ -0,0 +1,163 @@
+# External packages
+import multiprocessing
+import queue
+import time
+
+# Internal modules
+from crawler.cache import open_cache
+from crawler.driver import new_driver_manager
+from crawler.fetchers import BrowserFetcher
+from crawler.worker import scrape_paper, task_url
+import config
+
+
+# Scrape ONE row with the browser of <manager> (see <DriverManager> in crawler/driver.py), under its watchdog. If the browser hung (and was
+# killed), the results (or the error of the WebDriver call the kill interrupted) are discarded and the row is retried with a fresh browser, up
+# to <config.driver_hang_retries> times.
+def scrape_with_driver(manager, fetcher, index, row, scraper_filter):
+    result = None
+    for attempt in range(config.driver_hang_retries + 1):
+        fetcher.driver = manager.get()
+        try:
+            with manager.watch():
+                result = scrape_paper(fetcher, index, row, scraper_filter)
+        except Exception as e:
+            if not manager.hung:
+                raise
+            error = e
+        if not manager.hung:
+            manager.served()
+            return result
+        manager.quit()
+        print(str(index) + " [Retry][Hung browser]: " + str(row["title"]))
+    if result is None:
+        raise error
+    return result
+
+
+# Worker process: owns ONE headless Chrome at a time (recycled and replaced by its <DriverManager>, see crawler/driver.py) and scrapes the rows
+# it takes off the shared <task_queue> until it gets None. Every row it takes is announced on <result_queue> (so that the row of a worker that
+# dies can be given up on, see <run_pool>), then answered there, along with the (seconds, status) of its fetches for the scheduler.
+def _worker(worker_id, task_queue, result_queue, scraper_filter):
+    manager = new_driver_manager()
+    cache = open_cache()
+    try:
+        fetcher = BrowserFetcher(None, cache)
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+            index, row = task
+            result_queue.put(("start", worker_id, index))
+            try:
+                updates, log = scrape_with_driver(manager, fetcher, index, row, scraper_filter)
+            except Exception as e:
+                print(str(index) + " [Error][Worker " + str(worker_id) + "]: " + str(e))
+                result_queue.put(("error", index, fetcher.pop_fetches()))
+                continue
+            result_queue.put((index, row["source"], updates, log, fetcher.pop_fetches()))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        try:
+            manager.quit()
+        except Exception as e:
+            pass
+        if cache is not None:
+            cache.close()
+        result_queue.put(("done", worker_id))
+
+
+# Scrape the <tasks> ((index, row) pairs) on <workers> processes, each with its own headless Chrome.
+# The rows are handed out by the <scheduler> (see crawler/scheduler.py): across hosts, and only while their host is within its limits.
+# Yields (index, source, updates, log) as the rows complete, i.e., NOT in the order of <tasks>.
+def run_pool(tasks, workers, scraper_filter, scheduler):
+    context = multiprocessing.get_context("spawn")
+    task_queue = context.Queue()
+    result_queue = context.Queue()
+    processes = [context.Process(target=_worker, args=(worker_id, task_queue, result_queue, scraper_filter)) for worker_id in range(workers)]
+    for process in processes:
+        process.start()
+
+    scheduler.add_tasks(tasks, task_url)
+    in_flight = dict()  # index -> host
+    taken = dict()  # worker_id -> index of the row it is scraping
+    closed = False
+
+    done = set()
+    try:
+        while len(done) < len(processes):
+            # Keep every worker busy with ONE row, as long as there are rows whose host can take another request.
+            while len(in_flight) < len(processes) - len(done):
+                task = scheduler.next_task()
+                if task is None:
+                    break
+                (index, row), host = task
+                in_flight[index] = host
+                task_queue.put((index, row))
+            if not closed and not scheduler.has_tasks():
+                for _ in processes:
+                    task_queue.put(None)
+                closed = True
+
+            # Wake up when the next host may be started (if rows are waiting for one), or for the next result.
+            timeout = min(max(scheduler.next_wait_time(), 0.05), 5) if scheduler.has_tasks() else 5
+            try:
+                result = result_queue.get(timeout=timeout)
+            except queue.Empty:
+                # A worker that died (e.g., was killed) without saying so is done too. Its row is given up on (left for the next run, as it
+                # may be what killed the worker), and its host's slot is given back.
+                for worker_id, process in enumerate(processes):
+                    if not process.is_alive() and worker_id not in done:
+                        print("Worker " + str(worker_id) + " exited unexpectedly (exit code " + str(process.exitcode) + ").")
+                        done.add(worker_id)
+                        if worker_id in taken:
+                            index = taken.pop(worker_id)
+                            print(str(index) + " [Skipped][Worker " + str(worker_id) + " died]")
+                            scheduler.release(in_flight.pop(index))
+                continue
+            if result[0] == "start":
+                taken[result[1]] = result[2]
+                continue
+            if result[0] == "done":
+                done.add(result[1])
+                continue
+            index = result[1] if result[0] == "error" else result[0]
+            taken = {worker_id: taken_index for worker_id, taken_index in taken.items() if taken_index != index}
+            if result[0] == "error":
+                scheduler.finish_fetches(in_flight.pop(index), result[2])
+                continue
+            index, source, updates, log, fetches = result
+            scheduler.finish_fetches(in_flight.pop(index), fetches)
+            yield index, source, updates, log
+    finally:
+        # On Ctrl-C (or any error in the caller), give the workers a chance to quit their drivers before terminating them.
+        if not closed:
+            for _ in processes:
+                task_queue.put(None)
+        for process in processes:
+            process.join(timeout=30)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+
+# Scrape the <tasks> one after the other with <fetcher>, in the order and at the pace of the <scheduler>. With a <manager> (see
+# <DriverManager> in crawler/driver.py), <fetcher> is a BrowserFetcher that is given the manager's current driver for every row.
+# Yields (index, source, updates, log) like <run_pool>.
+def run_sequential(fetcher, tasks, scraper_filter, scheduler, manager=None):
+    scheduler.add_tasks(tasks, task_url)
+    while scheduler.has_tasks():
+        task = scheduler.next_task()
+        if task is None:
+            time.sleep(max(scheduler.next_wait_time(), 0.05))
+            continue
+        (index, row), host = task
+        try:
+            if manager is not None:
+                updates, log = scrape_with_driver(manager, fetcher, index, row, scraper_filter)
+            else:
+                updates, log = scrape_paper(fetcher, index, row, scraper_filter)
+        finally:
+            scheduler.finish_fetches(host, fetcher.pop_fetches())
+        yield index, row["source"], updates, log
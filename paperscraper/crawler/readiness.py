@@ -0,0 +1,33 @@
+# External packages
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Internal modules
+from scrapers.registry import publishers
+
+
+# CSS selectors of the content that the scrapers (see scrapers/) look for on a publisher's landing page, as declared in scrapers/registry.py.
+# The page is considered ready as soon as ANY of the selectors of the listed publishers is present.
+ready_selectors = {publisher: entry["ready"] for publisher, entry in publishers.items() if "ready" in entry}
+
+# Same as above, for the pages that some publishers need to be re-navigated to for the keywords.
+keywords_ready_selectors = {publisher: entry["keywords_ready"] for publisher, entry in publishers.items() if "keywords_ready" in entry}
+
+
+def _document_complete(driver):
+    return driver.execute_script("return document.readyState") == "complete"
+
+
+# Wait until the content of (any of) the <publishers> has been rendered, but no longer than <timeout> seconds.
+# Publishers without a selector wait for the document to finish loading. Returns False on timeout; the page may still be (partially) usable.
+def wait_until_ready(driver, publishers, timeout, selectors=None):
+    selectors = selectors if selectors is not None else ready_selectors
+    css = ", ".join(selector for publisher in publishers for selector in selectors.get(publisher, ready_selectors.get(publisher, [])))
+    condition = EC.presence_of_element_located((By.CSS_SELECTOR, css)) if css else _document_complete
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.2).until(condition)
+        return True
+    except TimeoutException:
+        return False
@@ -0,0 +1,194 @@
+# External packages
+from collections import deque
+from urllib.parse import urlsplit
+import time
+
+# Internal modules
+import config
+
+
+# Statuses that mean "slow down".
+throttle_statuses = (429, 503)
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_take(self, now):
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def wait_time(self, now):
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+
+class HostState:
+    def __init__(self, rate, burst, concurrency):
+        self.bucket = TokenBucket(rate, burst)
+        self.base_rate = rate
+        self.limit = concurrency
+        self.in_flight = 0
+        self.successes = 0
+        self.paused_until = 0.0
+
+
+# Keeps every publisher host (ieeexplore.ieee.org, dl.acm.org, link.springer.com, ...) within its limits while keeping all of them busy:
+# - a token bucket per host caps the request rate (<rate> per second, or <host_rates>[host]),
+# - the number of concurrent requests per host adapts: it grows by one after a full window of fast successes, shrinks by one when
+#   responses are slower than <target_latency>, and is halved (along with the rate, plus a pause of <cooldown> seconds) on a 429/503,
+# - rows are interleaved across hosts instead of being processed in file order.
+class HostScheduler:
+    def __init__(self, rate=1.0, burst=2, initial_concurrency=2, max_concurrency=8, target_latency=10.0, cooldown=30.0,
+                 host_rates=None, doi_prefix_hosts=None):
+        self.rate = rate
+        self.burst = burst
+        self.initial_concurrency = initial_concurrency
+        self.max_concurrency = max_concurrency
+        self.target_latency = target_latency
+        self.cooldown = cooldown
+        self.host_rates = host_rates or dict()
+        self.doi_prefix_hosts = doi_prefix_hosts or dict()
+        self.hosts = dict()
+        self.queues = dict()
+        self.order = deque()
+
+    # The publisher host of a URL. DBLP links to most papers through doi.org, so DOIs are mapped to their publisher's host by their prefix.
+    def host_of(self, url):
+        if not url:
+            return ""
+        parts = urlsplit(str(url))
+        host = parts.netloc.lower()
+        if host.startswith("www."):
+            host = host[len("www."):]
+        if host in ("doi.org", "dx.doi.org"):
+            prefix = parts.path.lstrip("/").split("/")[0]
+            return self.doi_prefix_hosts.get(prefix, host)
+        return host
+
+    # Requests per second that <host> is allowed (before any throttling).
+    def host_rate(self, host):
+        return self.host_rates.get(host, self.rate)
+
+    def _state(self, host):
+        if host not in self.hosts:
+            self.hosts[host] = HostState(self.host_rate(host), self.burst, self.initial_concurrency)
+        return self.hosts[host]
+
+    # Start a request to <host> if it has a free slot and a token. Requests without a host are not limited.
+    def try_start(self, host):
+        if not host:
+            return True
+        state = self._state(host)
+        now = time.monotonic()
+        if now < state.paused_until or state.in_flight >= state.limit or not state.bucket.try_take(now):
+            return False
+        state.in_flight += 1
+        return True
+
+    # Seconds until <host> may (at the earliest) be started again.
+    def wait_time(self, host):
+        if not host:
+            return 0.0
+        state = self._state(host)
+        now = time.monotonic()
+        return max(state.paused_until - now, state.bucket.wait_time(now), 0.0)
+
+    # Give back the slot of a request to <host> that never finished (e.g., its worker died), without counting it either way.
+    def release(self, host):
+        if host:
+            state = self._state(host)
+            state.in_flight = max(0, state.in_flight - 1)
+
+    # Record a finished request to <host>: how long it took and its status (None if unknown, e.g., in a browser).
+    def finish(self, host, latency, status=None):
+        if not host:
+            return
+        state = self._state(host)
+        state.in_flight = max(0, state.in_flight - 1)
+        if status in throttle_statuses:
+            if time.monotonic() < state.paused_until:
+                # Requests that were already in flight when the host started throttling us.
+                return
+            state.limit = max(1, state.limit // 2)
+            state.bucket.rate = max(state.base_rate / 16, state.bucket.rate / 2)
+            state.paused_until = time.monotonic() + self.cooldown
+            state.successes = 0
+            print("[Scheduler] " + host + " answered " + str(status) + ": concurrency " + str(state.limit) + ", " + "%.2f" % state.bucket.rate + " req/s")
+        elif latency > self.target_latency:
+            state.limit = max(1, state.limit - 1)
+            state.successes = 0
+        else:
+            state.bucket.rate = min(state.base_rate, state.bucket.rate * 1.1)
+            state.successes += 1
+            if state.successes >= state.limit:
+                state.limit = min(self.max_concurrency, state.limit + 1)
+                state.successes = 0
+
+    # Record a finished task (which may have fetched several pages of <host>) from its <fetches>: (seconds, status) pairs.
+    def finish_fetches(self, host, fetches):
+        statuses = [status for seconds, status in fetches if status in throttle_statuses]
+        latency = max((seconds for seconds, status in fetches), default=0.0)
+        self.finish(host, latency, statuses[0] if len(statuses) > 0 else None)
+
+    # Order <tasks> round-robin across their hosts, e.g., [ieee, ieee, acm] -> [ieee, acm, ieee].
+    def interleave(self, tasks, url_of):
+        queues = dict()
+        for task in tasks:
+            queues.setdefault(self.host_of(url_of(task)), deque()).append(task)
+        result = list()
+        while queues:
+            for host in list(queues):
+                result.append(queues[host].popleft())
+                if not queues[host]:
+                    del queues[host]
+        return result
+
+    # Queue <tasks> for <next_task>.
+    def add_tasks(self, tasks, url_of):
+        for task in tasks:
+            host = self.host_of(url_of(task))
+            if host not in self.queues:
+                self.queues[host] = deque()
+                self.order.append(host)
+            self.queues[host].append(task)
+
+    def has_tasks(self):
+        return len(self.order) > 0
+
+    # The next queued task whose host can be started right now (round-robin across hosts), along with its host. None if there is none.
+    def next_task(self):
+        for _ in range(len(self.order)):
+            host = self.order[0]
+            self.order.rotate(-1)
+            if self.try_start(host):
+                task = self.queues[host].popleft()
+                if not self.queues[host]:
+                    del self.queues[host]
+                    self.order.remove(host)
+                return task, host
+        return None
+
+    # Seconds until any of the queued hosts may be started.
+    def next_wait_time(self):
+        return min((self.wait_time(host) for host in self.order), default=0.0)
+
+    def summary(self):
+        return {host: {"concurrency": state.limit, "rate": round(state.bucket.rate, 3)} for host, state in self.hosts.items()}
+
+
+def new_scheduler():
+    return HostScheduler(rate=config.host_rate, burst=config.host_burst, initial_concurrency=config.host_initial_concurrency,
+                         max_concurrency=config.host_max_concurrency, target_latency=config.host_target_latency,
+                         cooldown=config.host_cooldown, host_rates=config.host_rates, doi_prefix_hosts=config.doi_prefix_hosts)
@@ -0,0 +1,262 @@
+# Internal modules
+from artifacts import as_list
+from crawler import errors
+from crawler.readiness import keywords_ready_selectors
+from dblp.ingest import scraped_fields
+from scrapers.dom import parse_html
+from scrapers import registry
+from scrapers.extract import extract_all, in_page_fields, keywords_pages, landing_page_fields, metadata_fields
+from scrapers.metadata import extract_metadata
+from scrapers.registry import resolve, supports
+import config
+
+
+# Counters that are logged (per source) to analyze the summary of a particular run.
+log_fields = ["papers",
+              "abstract_parse_errors", "abstract_fetch_errors", "abstract_errors",
+              "keyword_parse_errors", "keyword_fetch_errors", "keyword_errors",
+              "no_of_citations_parse_errors", "no_of_citations_fetch_errors", "no_of_citations_errors"] + \
+             [error_class + "_errors" for error_class in errors.error_classes]
+
+
+# State of a field that none of the publishers of a paper's venue provide.
+unsupported = "Unsupported"
+
+
+def new_log_entry():
+    return {field: 0 for field in log_fields}
+
+
+# URLs of the paper, in order of preference.
+def paper_urls(row):
+    urls = as_list(row["ee"])
+    if len(urls) == 0:
+        # If not ee, check url.
+        # But, this doesn't have HTTP/HTTPS it seems to be following some Relative Paths from a BaseURL that is unknown.
+        # Hence, it will fail 99% of the times.
+        urls = as_list(row["url"])
+    return urls
+
+
+# Fields of <row> whose current state is in the <scraper_filter>, and that are due (failed fields wait for their retry, see crawler/errors.py).
+def wanted_fields(row, scraper_filter, now=None):
+    return [field for field in scraped_fields if str(row[field]) in scraper_filter[field] and errors.is_due(row, field, now)]
+
+
+# The wanted fields of <row> that (at least one of) its venue's publishers provide, i.e., that its pages have to be fetched for.
+def fields_to_scrape(row, scraper_filter):
+    publishers = config.interesting_venues[row["source"]]["publishers"]
+    return [field for field in wanted_fields(row, scraper_filter) if supports(publishers, field)]
+
+
+def unsupported_fields(row, scraper_filter):
+    publishers = config.interesting_venues[row["source"]]["publishers"]
+    return [field for field in wanted_fields(row, scraper_filter) if not supports(publishers, field)]
+
+
+# URL of a task ((index, row) pair) that the scheduler attributes it to (see crawler/scheduler.py).
+def task_url(task):
+    urls = paper_urls(task[1])
+    return urls[0] if len(urls) > 0 else ""
+
+
+# Some publishers show the KEYWORDS on a different URL than the landing page (<current_url>), see <keywords_pages> in scrapers/extract.py.
+def keywords_url(publisher, current_url):
+    return current_url + keywords_pages.get(publisher, "")
+
+
+# A page that the <fetcher> navigated to, whose fields are extracted as cheaply as possible (see <extract>): its html is only transferred,
+# read for metadata and parsed when an extractor needs it, and at most once. Only a <landing> page embeds metadata, and on it the extractors
+# only run for the fields shown there (the keywords of some publishers are on a different page, see <keywords_pages> in scrapers/extract.py).
+class Page:
+    def __init__(self, fetcher, url, publishers, timeout, selectors=None, landing=True):
+        self.fetcher = fetcher
+        self.landing = landing
+        self.embedded_metadata = landing and config.embedded_metadata
+        # Only a browser (see crawler/fetchers.py) can run the extractors inside the page.
+        self.in_page = config.in_page_extraction and hasattr(fetcher, "extract_in_page")
+        self._source = None
+        self._metadata = None
+        self._doc = None
+        if self.in_page:
+            fetcher.load(url, publishers, timeout, selectors=selectors)
+        else:
+            self._source = fetcher.get(url, publishers, timeout, selectors=selectors)
+
+    def source(self):
+        if self._source is None:
+            self._source = self.fetcher.source()
+        return self._source
+
+    def metadata(self):
+        if self._metadata is None:
+            self._metadata = extract_metadata(self.source())
+        return self._metadata
+
+    def doc(self):
+        if self._doc is None:
+            self._doc = parse_html(self.source())
+        return self._doc
+
+    # The <fields> of <publisher>: from the in-page extractors if enabled (see scrapers/in_page.py), then from the embedded metadata (see
+    # scrapers/metadata.py), then from the parsed page. Returns field -> value, or None if not found.
+    def extract(self, publisher, fields):
+        values = dict()
+        extractable = landing_page_fields(publisher, fields) if self.landing else fields
+        scripted = in_page_fields(publisher, extractable) if self.in_page else []
+        if len(scripted) > 0:
+            values.update(self.fetcher.extract_in_page(registry.publishers[publisher]["in_page"], scripted))
+        if self.embedded_metadata:
+            for field in metadata_fields(publisher, [field for field in fields if field not in values]):
+                if field in self.metadata():
+                    values[field] = self.metadata()[field]
+        missing = [field for field in extractable if field not in values]
+        if len(missing) > 0:
+            values.update(extract_all(publisher, self.doc(), missing))
+        return values
+
+
+def merge_log(log_obj, source, log):
+    if source not in log_obj:
+        log_obj[source] = new_log_entry()
+    for field, count in log.items():
+        log_obj[source][field] = log_obj[source].get(field, 0) + count
+
+
+# Mark <field> of <row> as failed with <error_class> in <updates> (see crawler/errors.py), and count it in <log>.
+def _fail(updates, log, row, field, error_class):
+    updates[field] = "Error"
+    updates.update(errors.failure_updates(row, field, error_class))
+    log[error_class + "_errors"] += 1
+
+
+def _succeed(updates, row, field, value):
+    updates[field] = value
+    updates.update(errors.success_updates(row, field))
+
+
+# Scrape the abstract, citation count and keywords of ONE paper (<row>, as a dict), getting its pages from <fetcher> (see crawler/fetchers.py).
+# Only the fields whose current state is in the <scraper_filter> are scraped. They are extracted from the landing page (see <Page>) with the
+# extractors of the publisher its URL belongs to (see <resolve> in scrapers/registry.py), and only the publishers that show their keywords
+# elsewhere (see <keywords_pages> in scrapers/extract.py) are navigated to a second page (unless the landing page's metadata has them).
+# Failed fields are set to "Error" along with why (see crawler/errors.py), which decides when they are retried.
+# Returns the fields to update in the papers table and the log counters of this paper.
+def scrape_paper(fetcher, index, row, scraper_filter):
+    updates = dict()
+    log = new_log_entry()
+
+    # Increment no of papers
+    log["papers"] += 1
+
+    # Get the URLs
+    urls = paper_urls(row)
+
+    # If there is No url OR If the URL begins with a db/, continue.
+    if len(urls) == 0 or urls[0].startswith("db/"):
+        updates['abstract'] = "No Url"
+        updates['keywords'] = "No Url"
+        updates['citation_count'] = "No Url"
+        print(str(index) + " [No URL]: " + row["title"])
+        return updates, log
+
+    publishers = config.interesting_venues[row["source"]]["publishers"]
+
+    # Fields that none of the venue's publishers provide (see scrapers/registry.py) are not scraped at all. This follows from the registry,
+    # not from a failed attempt: no retry is scheduled, and the field is scraped again as soon as "Unsupported" is in the <scraper_filter>.
+    for field in unsupported_fields(row, scraper_filter):
+        updates[field] = unsupported
+        updates.update(errors.success_updates(row, field))
+        log[errors.unsupported + "_errors"] += 1
+        print(str(index) + " [Unsupported][" + field + "]: " + str(row["source"]))
+    fields = fields_to_scrape(row, scraper_filter)
+    if len(fields) == 0:
+        return updates, log
+
+    # LANDING PAGE: fetched once, then every publisher's fields are extracted from the same page (see <Page>).
+    page = None
+    current_url = None
+    fetch_error = None
+    try:
+        page = Page(fetcher, urls[0], publishers, config.page_ready_timeout)
+        current_url = fetcher.current_url
+    except Exception as e:
+        page = None
+        fetch_error = errors.classify(e)
+        print('Abstract: ' + str(e))
+
+    # The publisher(s) of the page, told by the host it ended up on (with the venue's publishers as a fallback).
+    page_publishers = resolve(current_url, publishers)
+
+    landing = dict()
+    if page is not None:
+        for publisher in page_publishers:
+            try:
+                # The fields of the landing page, and those its embedded metadata may carry (e.g., IEEE Xplore's keywords).
+                page_fields = landing_page_fields(publisher, fields)
+                landing[publisher] = page.extract(publisher, page_fields + [field for field in metadata_fields(publisher, fields) if field not in page_fields])
+            except Exception as e:
+                print(e)
+                landing[publisher] = dict()
+
+    # ABSTRACT
+    if "abstract" in fields:
+        abstract = next((landing[publisher].get("abstract") for publisher in landing if landing[publisher].get("abstract") is not None), None)
+        if abstract is not None:
+            _succeed(updates, row, 'abstract', abstract)
+            print(str(index) + " [Success][Abstract] " + str(urls[0]) + " " + str(abstract)[:50])
+        elif page is not None:
+            _fail(updates, log, row, 'abstract', errors.parse_miss)
+            print(str(index) + " [Error][Abstract Parse]: " + str(urls[0]) + " : " + str(row["source"]))
+            log["abstract_parse_errors"] += 1
+            log["abstract_errors"] += 1
+        else:
+            _fail(updates, log, row, 'abstract', fetch_error)
+            print(str(index) + " [Error][Abstract URL Fetch]: " + str(row["source"]))
+            log["abstract_fetch_errors"] += 1
+            log["abstract_errors"] += 1
+
+    # No. of CITATIONS
+    if "citation_count" in fields:
+        citation_count = next((landing[publisher].get("citation_count") for publisher in landing if landing[publisher].get("citation_count") is not None), None)
+        if citation_count is not None:
+            _succeed(updates, row, 'citation_count', citation_count)
+            print(str(index) + " [Success][Citation Count] " + str(urls[0]) + " " + str(citation_count))
+        elif page is not None:
+            _fail(updates, log, row, 'citation_count', errors.parse_miss)
+            print(str(index) + " [Error][Citation Parse]: " + str(urls[0]) + " : " + str(row["source"]))
+            log["no_of_citations_parse_errors"] += 1
+            log["no_of_citations_errors"] += 1
+        else:
+            _fail(updates, log, row, 'citation_count', fetch_error)
+            print(str(index) + " [Error][Citation Count URL Fetch]: " + str(row["source"]))
+            log["no_of_citations_fetch_errors"] += 1
+            log["no_of_citations_errors"] += 1
+
+    # KEYWORDS
+    # Taken from the landing page, or from a different URL for some publishers (in the order of the publishers).
+    if "keywords" in fields:
+        keywords_list = None
+        keywords_error = fetch_error if page is None else errors.parse_miss
+        if page is not None:
+            for publisher in page_publishers:
+                if landing[publisher].get("keywords") is not None:
+                    keywords_list = landing[publisher]["keywords"]
+                elif publisher in keywords_pages:
+                    try:
+                        keywords_page = Page(fetcher, keywords_url(publisher, current_url), [publisher], config.keywords_page_ready_timeout, selectors=keywords_ready_selectors, landing=False)
+                        keywords_list = keywords_page.extract(publisher, ["keywords"])["keywords"]
+                    except Exception as e:
+                        keywords_error = errors.classify(e)
+                if keywords_list is not None:
+                    break
+
+        if keywords_list is not None:
+            _succeed(updates, row, 'keywords', keywords_list)
+            print(str(index) + " [Success][Keywords] " + str(urls[0]) + " " + str(keywords_list))
+        else:
+            _fail(updates, log, row, 'keywords', keywords_error)
+            print(str(index) + " [Error][Keywords Parse]: " + str(urls[0]) + " : " + str(row["source"]))
+            log["keyword_parse_errors"] += 1
+            log["keyword_errors"] += 1
+
+    return updates, log
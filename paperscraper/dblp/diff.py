@@ -0,0 +1,67 @@
+# External packages
+import os
+import pandas as pd
+
+# Internal modules
+from artifacts import read_table, tsv_path
+from dblp.ingest import scraped_fields
+
+
+# Columns that hold scraped data, including any per-field bookkeeping columns (e.g., `abstract_attempts`).
+def is_scraped_column(column):
+    return any(column == field or column.startswith(field + "_") for field in scraped_fields)
+
+
+# Rows of the previous <config.path_output>, keyed on their DBLP `key`.
+def load_previous_snapshot(path):
+    if not os.path.exists(path) and not os.path.exists(tsv_path(path)):
+        return dict()
+    df_previous = read_table(path)
+    if "key" not in df_previous.columns:
+        print("The previous output has no `key` column (it predates incremental updates); all records are treated as new.")
+        return dict()
+    return {row["key"]: row for row in df_previous.to_dict("records")}
+
+
+# Carry the scraped fields of the previous row over into <obj>, which holds the DBLP fields of the new snapshot.
+# Returns "unchanged" if the DBLP content is the same as before, else "changed".
+def carry_over(obj, previous_row):
+    for column, value in previous_row.items():
+        if is_scraped_column(column):
+            obj[column] = value
+    return "unchanged" if previous_row.get("content_hash") == obj["content_hash"] else "changed"
+
+
+def diff_entry(row, status):
+    return {"key": row.get("key"), "status": status, "title": row.get("title"), "source": row.get("source"), "year": row.get("year")}
+
+
+# Records of the previous snapshot that are no longer in the new one.
+def removed_entries(previous_rows, seen_keys):
+    return [diff_entry(row, "removed") for key, row in previous_rows.items() if key not in seen_keys]
+
+
+# Incremental update: wrap the <rows> of a new DBLP snapshot to carry the scraped fields of the records (matched on their DBLP `key`) that are
+# already in the previous output (<path_previous>) over into them. Yields (row, whether it was in the previous output). Once the <rows> are
+# exhausted, what has changed since the previous snapshot (added, changed and removed records) is written to <path_diff>.
+# Without <enabled>, every row is yielded as new and no diff is written.
+def diff_snapshot(rows, path_previous, path_diff, enabled=True):
+    previous_rows = load_previous_snapshot(path_previous) if enabled else dict()
+    diff_list = list()
+    seen_keys = set()
+    for obj in rows:
+        seen_keys.add(obj["key"])
+        if obj["key"] in previous_rows:
+            status = carry_over(obj, previous_rows[obj["key"]])
+        else:
+            status = "added"
+        if enabled and status != "unchanged":
+            diff_list.append(diff_entry(obj, status))
+        yield obj, status != "added"
+
+    # Persist what has changed since the previous snapshot
+    if enabled:
+        diff_list.extend(removed_entries(previous_rows, seen_keys))
+        df_diff = pd.DataFrame(diff_list, columns=["key", "status", "title", "source", "year"])
+        df_diff.to_csv(path_diff, sep='\t', header=True, index=False)
+        print(df_diff["status"].value_counts().to_dict())
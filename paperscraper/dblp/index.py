@@ -0,0 +1,148 @@
+# External packages
+from array import array
+import lxml.etree as ET
+import gzip
+import json
+import os
+import re
+
+# Internal modules
+from dblp.ingest import record_to_row
+from dblp.records import record_tags, venue_tags
+from dblp.shards import read_prolog, regex_record_start
+from dblp.stream import fix_ee_ampersands
+
+
+regex_record_tag = re.compile(rb'<(\w+)')
+regex_key = re.compile(rb'\skey="([^"]*)"')
+regex_venue = re.compile(rb'<(' + b'|'.join(tag.encode() for tag in venue_tags) + rb')>(.*?)</\1>', re.S)
+
+# Parser for standalone records (with the prolog prepended), see <parse_record>.
+parser = ET.XMLParser(recover=True, encoding='UTF-8', huge_tree=True)
+
+
+# Yield (offset, bytes) of every record of the (uncompressed) DBLP xml in <f>, without parsing it.
+def iter_record_spans(f, buffer_size=16 * 1024 * 1024):
+    base = 0
+    buf = b""
+    while True:
+        chunk = f.read(buffer_size)
+        buf += chunk
+        # A record starts right after each match (the match itself starts at the preceding newline).
+        starts = [match.start() + 1 for match in regex_record_start.finditer(buf)]
+        if not chunk:
+            if starts:
+                end = buf.rfind(b"</dblp>")
+                starts.append(end if end > starts[-1] else len(buf))
+                for start, stop in zip(starts[:-1], starts[1:]):
+                    yield base + start, buf[start:stop]
+            return
+        for start, stop in zip(starts[:-1], starts[1:]):
+            yield base + start, buf[start:stop]
+        if starts:
+            # Keep the last (possibly incomplete) record, including its leading newline so that it is matched again.
+            keep = starts[-1] - 1
+            base += keep
+            buf = buf[keep:]
+
+
+# Parse a standalone record the same way as a full pass over DBLP does.
+def parse_record(prolog, data):
+    return ET.fromstring(prolog + fix_ee_ampersands(data) + b"</dblp>\n", parser)[0]
+
+
+def _venue_text(prolog, tag, raw):
+    if not raw:
+        return None
+    if b"&" not in raw:
+        return raw.decode("utf-8")
+    # Entities have to be resolved exactly as lxml does in a full pass (it e.g. stops at undefined ones).
+    return parse_record(prolog, b"<" + tag + b">" + raw + b"</" + tag + b">").text
+
+
+# One-time indexing pass over the (uncompressed) DBLP xml at <path>.
+# Returns the venue counts (in the format of 1-get_unique_venues.py) and, for every (venue tag, venue), the byte offsets, lengths and keys
+# of its records.
+def build_index(path, buffer_size=16 * 1024 * 1024):
+    prolog = read_prolog(path)
+    unique_sources = dict()
+    index = dict()
+    with open(path, "rb") as f:
+        for offset, data in iter_record_spans(f, buffer_size):
+            elem_tag = regex_record_tag.match(data).group(1).decode()
+            if elem_tag not in record_tags:
+                continue
+            key = regex_key.search(data)
+            key = key.group(1).decode() if key else ""
+            for match in regex_venue.finditer(data):
+                child_tag = match.group(1).decode()
+                venue = _venue_text(prolog, match.group(1), match.group(2))
+
+                if venue not in unique_sources:
+                    unique_sources[venue] = dict()
+                    unique_sources[venue]["count"] = 0
+                    unique_sources[venue]["child_tag"] = child_tag
+                    unique_sources[venue]["elem_tag"] = elem_tag
+                unique_sources[venue]["count"] += 1
+
+                if (child_tag, venue) not in index:
+                    index[(child_tag, venue)] = (array("q"), array("q"), list())
+                offsets, lengths, keys = index[(child_tag, venue)]
+                offsets.append(offset)
+                lengths.append(len(data))
+                keys.append(key)
+    return unique_sources, index
+
+
+def _fingerprint(path):
+    stat = os.stat(path)
+    return {"path": os.path.abspath(path), "size": stat.st_size, "mtime": int(stat.st_mtime)}
+
+
+# Persist the index as a gzipped TSV with ONE line per venue: venue tag, venue, delta-encoded offsets, lengths and keys.
+# The first line records which xml the offsets belong to.
+def write_index(path_index, path, index):
+    with gzip.open(path_index, "wt", encoding="utf-8", compresslevel=6) as f:
+        f.write("# " + json.dumps(_fingerprint(path)) + "\n")
+        for (child_tag, venue), (offsets, lengths, keys) in index.items():
+            deltas = [offsets[0]] + [b - a for a, b in zip(offsets, offsets[1:])]
+            f.write("\t".join([child_tag, "" if venue is None else venue,
+                               ",".join(map(str, deltas)), ",".join(map(str, lengths)), ",".join(keys)]) + "\n")
+
+
+# The index is only valid for the exact xml it was built from.
+def is_index_valid(path_index, path):
+    if not os.path.exists(path_index) or not os.path.exists(path):
+        return False
+    with gzip.open(path_index, "rt", encoding="utf-8") as f:
+        header = f.readline()
+    return header.startswith("# ") and json.loads(header[2:]) == _fingerprint(path)
+
+
+# Look up the (offset, length, key) of every record of the <interesting_venues>, in file order.
+def read_index(path_index, interesting_venues):
+    wanted = {(venue_info["sourcetype"], venue) for venue, venue_info in interesting_venues.items()}
+    records = list()
+    with gzip.open(path_index, "rt", encoding="utf-8") as f:
+        f.readline()
+        for line in f:
+            child_tag, venue, rest = line.split("\t", 2)
+            if (child_tag, venue) not in wanted:
+                continue
+            deltas, lengths, keys = rest.rstrip("\n").split("\t")
+            offset = 0
+            for delta, length, key in zip(deltas.split(","), lengths.split(","), keys.split(",")):
+                offset += int(delta)
+                records.append((offset, int(length), key))
+    return sorted(set(records))
+
+
+# Re-filter the DBLP xml at <path> for the <interesting_venues> by seeking straight to their records, instead of parsing the whole file.
+def iter_indexed_rows(path, path_index, interesting_venues):
+    prolog = read_prolog(path)
+    with open(path, "rb") as f:
+        for offset, length, key in read_index(path_index, interesting_venues):
+            f.seek(offset)
+            obj = record_to_row(parse_record(prolog, f.read(length)), interesting_venues)
+            if obj is not None:
+                yield obj
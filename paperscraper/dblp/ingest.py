@@ -0,0 +1,77 @@
+# External packages
+import pandas as pd
+import hashlib
+import json
+
+# Internal modules
+from dblp.prior import find_in_prior_corpus
+from dblp.records import venue_tags
+
+
+# Count the venue (journal/booktitle) of a DBLP record into <unique_sources>.
+def count_venue(unique_sources, elem):
+    for child in elem:
+        if child.tag in venue_tags:
+            if child.text not in unique_sources:
+                unique_sources[child.text] = dict()
+                unique_sources[child.text]["count"] = 0
+                unique_sources[child.text]["child_tag"] = child.tag
+                unique_sources[child.text]["elem_tag"] = elem.tag
+            unique_sources[child.text]["count"] += 1
+
+
+def venues_to_dataframe(unique_sources):
+    return pd.DataFrame.from_dict(unique_sources, orient="index")
+
+
+# Fields that are scraped in 3-update.py (as opposed to the ones that come from DBLP).
+# TODO: Update these if more fields are added.
+scraped_fields = ["abstract", "keywords", "citation_count"]
+
+
+# Hash of the DBLP content of a row, used to tell whether a record has changed between two DBLP snapshots.
+def content_hash(obj):
+    return hashlib.sha1(json.dumps(obj, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+# Flatten a DBLP record into a row, along with its DBLP `key` and a hash of its content. Returns None if the record is not from one of the <interesting_venues>.
+def record_to_row(elem, interesting_venues):
+    obj = {"key": elem.get("key")}
+    to_add = False
+    for child in elem:
+        if child.tag not in obj:
+            if child.tag in ["author", "ee", "url"]:
+                obj[child.tag] = list()
+            else:
+                obj[child.tag] = None
+
+        if child.tag in ["author", "ee", "url"]:
+            if child.text is not None:
+                obj[child.tag].append(child.text.replace("%26", "&"))
+            else:
+                obj[child.tag].append(child.text)
+        else:
+            obj[child.tag] = child.text # title, year, pgs
+
+        # Only consider adding entries from the source defined above
+        if child.text in interesting_venues and child.tag == interesting_venues[child.text]["sourcetype"]:
+            obj["source"] = child.text
+            to_add = True
+
+    if not to_add:
+        return None
+    obj["content_hash"] = content_hash(obj)
+    return obj
+
+
+# Initialize the fields that we are going to scrape, and update them if they have already been scraped before.
+# Returns True if the paper was found in the prior corpus.
+def init_scraped_fields(obj, papers_existing_in_prev_corpus):
+    for field in scraped_fields:
+        obj[field] = "Not Scraped"
+
+    existing = find_in_prior_corpus(obj, papers_existing_in_prev_corpus)
+    if existing is not None:
+        obj["abstract"], obj["keywords"] = existing
+        return True
+    return False
@@ -0,0 +1,105 @@
+# External packages
+from difflib import SequenceMatcher
+import re
+import unicodedata
+
+
+# A DOI anywhere in a URL, e.g., https://doi.org/10.1109/TVCG.2021.3114820 or https://dl.acm.org/doi/10.1145/3313831.3376224
+regex_doi = re.compile(r'(10\.\d{4,9}/[^\s"<>?#]+)')
+regex_non_alnum = re.compile(r'[^0-9a-z]+')
+
+# Fields of a prior corpus record that may hold a DOI (or a URL with a DOI in it).
+doi_fields = ("DOI", "doi", "URL", "Url", "url", "ee", "Link")
+
+
+def extract_doi(url):
+    if url is None:
+        return None
+    match = regex_doi.search(str(url))
+    if match is None:
+        return None
+    return match.group(1).rstrip("/.").lower()
+
+
+# Title without case, accents, punctuation and extra whitespace, e.g., "Data-Driven  Guides:" -> "data driven guides"
+def normalize_title(title):
+    if title is None:
+        return ""
+    folded = unicodedata.normalize("NFKD", str(title)).encode("ascii", "ignore").decode("ascii").lower()
+    return regex_non_alnum.sub(" ", folded).strip()
+
+
+def block_key(year, source):
+    return str(year).strip(), " ".join(str(source).split()).casefold()
+
+
+# Matches DBLP rows against the prior VitaLITy corpus by (1) DOI, (2) normalized title and (3) approximately matching the normalized title,
+# in that order. Titles are only compared within the same block, i.e., the same year and venue.
+# Only the values to reuse (e.g., Abstract, Keywords) are kept for each paper.
+class PriorCorpus:
+    def __init__(self, threshold=0.93):
+        self.threshold = threshold
+        self.by_doi = dict()
+        self.blocks = dict()
+        self.stats = {"doi": 0, "title": 0, "fuzzy": 0, "none": 0}
+
+    def __len__(self):
+        return sum(len(block["titles"]) for block in self.blocks.values())
+
+    def add(self, title, source, year, value, dois=()):
+        for doi in dois:
+            if doi is not None:
+                self.by_doi[doi] = value
+
+        normalized = normalize_title(title)
+        if not normalized:
+            return
+        block = self.blocks.setdefault(block_key(year, source), {"titles": dict(), "tokens": dict()})
+        block["titles"][normalized] = value
+        for token in set(normalized.split()):
+            block["tokens"].setdefault(token, list()).append(normalized)
+
+    def _fuzzy(self, block, normalized):
+        # Candidates share at least one of the longest (i.e., most distinctive) tokens of the title.
+        tokens = sorted(set(normalized.split()), key=len, reverse=True)[:3]
+        candidates = set()
+        for token in tokens:
+            candidates.update(block["tokens"].get(token, ()))
+
+        best, best_ratio = None, self.threshold
+        for candidate in candidates:
+            matcher = SequenceMatcher(None, normalized, candidate, autojunk=False)
+            if matcher.real_quick_ratio() < best_ratio or matcher.quick_ratio() < best_ratio:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= best_ratio:
+                best, best_ratio = candidate, ratio
+        return block["titles"][best] if best is not None else None
+
+    # Returns the reused values for a DBLP row (with its title, source, year and ee) and how it was matched, or (None, "none").
+    def match(self, obj):
+        for url in obj.get("ee") or []:
+            doi = extract_doi(url)
+            if doi is not None and doi in self.by_doi:
+                return self.by_doi[doi], "doi"
+
+        block = self.blocks.get(block_key(obj.get("year"), obj.get("source")))
+        normalized = normalize_title(obj.get("title"))
+        if block is not None and normalized:
+            if normalized in block["titles"]:
+                return block["titles"][normalized], "title"
+            value = self._fuzzy(block, normalized)
+            if value is not None:
+                return value, "fuzzy"
+        return None, "none"
+
+    def lookup(self, obj):
+        value, method = self.match(obj)
+        self.stats[method] += 1
+        return value
+
+    def report(self):
+        total = sum(self.stats.values())
+        matched = total - self.stats["none"]
+        return "Prior corpus: %d of %d papers matched (%.1f%%) - by DOI: %d, by title: %d, approximately: %d" % (
+            matched, total, 100.0 * matched / max(total, 1), self.stats["doi"], self.stats["title"], self.stats["fuzzy"])
@@ -0,0 +1,33 @@
+# External packages
+import os
+
+# Internal modules
+from dblp.ingest import count_venue, record_to_row
+from dblp.records import iter_records, record_tags
+from dblp.shards import iter_shard_results, merge_venue_counts
+from dblp.stream import EeFixingReader, is_seekable, open_dblp
+
+
+# Stream the rows of the <interesting_venues> out of the DBLP xml at <path>, counting every venue into <unique_sources> on the way.
+# The <ee></ee> tags are fixed on the fly, so <path> can be the raw or the processed xml (gzipped or not, or "-" for stdin).
+# With workers > 1 and an uncompressed file on disk, the xml is split into shards that are parsed on a process pool; rows still come out in file order.
+# <progress> is updated with the number of (uncompressed) bytes read so far.
+def iter_rows(path, interesting_venues, unique_sources, workers=1, shard_size=64 * 1024 * 1024, buffer_size=16 * 1024 * 1024, progress=None):
+    progress = progress if progress is not None else dict()
+    if workers > 1 and is_seekable(path):
+        for shard_sources, shard_rows in iter_shard_results(path, interesting_venues, workers, shard_size):
+            merge_venue_counts(unique_sources, shard_sources)
+            yield from shard_rows
+        progress["bytes_read"] = os.path.getsize(path)
+        return
+
+    if workers > 1:
+        print("Parallel ingest needs an uncompressed file on disk; falling back to a single process for " + str(path))
+
+    reader = EeFixingReader(open_dblp(path), buffer_size=buffer_size)
+    for elem in iter_records(reader, tags=record_tags, encoding='UTF-8'):
+        count_venue(unique_sources, elem)
+        obj = record_to_row(elem, interesting_venues)
+        progress["bytes_read"] = reader.bytes_read
+        if obj is not None:
+            yield obj
@@ -0,0 +1,66 @@
+# External packages
+import pandas as pd
+import json
+import os
+
+# Internal modules
+from dblp.matching import PriorCorpus, doi_fields, extract_doi
+
+
+# Fields of the prior VitaLITy corpus that are reused for papers that have already been scraped before.
+reused_fields = ("Abstract", "Keywords")
+
+
+# Stream the records of a JSON array (e.g., the prior VitaLITy corpus) one by one, instead of loading the whole file into memory.
+# A record that does not decode within <max_record_size> characters is malformed (rather than cut off at the end of the buffer): ValueError.
+def iter_json_records(path, buffer_size=1024 * 1024, max_record_size=64 * 1024 * 1024):
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buf = f.read(buffer_size).lstrip()
+        if not buf.startswith("["):
+            # Not an array of records (e.g., a DataFrame saved with another orient): read it in one go.
+            f.seek(0)
+            yield from pd.read_json(f).to_dict("records")
+            return
+        pos = 1
+        while True:
+            # Skip the separators, reading more if needed.
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos == len(buf):
+                buf, pos = f.read(buffer_size), 0
+                if not buf:
+                    return
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                record, pos = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError as e:
+                # The record is cut off at the end of the buffer.
+                if len(buf) - pos > max_record_size:
+                    raise ValueError("Malformed record in " + str(path) + ": not valid JSON within " + str(max_record_size) + " characters") from e
+                chunk = f.read(buffer_size)
+                if not chunk:
+                    raise
+                buf, pos = buf[pos:] + chunk, 0
+                continue
+            yield record
+
+
+# Articles already scraped from previously scraped VitaLITy corpus.
+# Returns a compact matcher (see dblp/matching.py) of (Abstract, Keywords) keyed on the DOI and the normalized Title within Year+Source blocks.
+# Only the reused fields are kept in memory, not the whole corpus (e.g., the embeddings).
+def load_prior_corpus(path, threshold=0.93):
+    papers_existing_in_prev_corpus = PriorCorpus(threshold=threshold)
+    if os.path.exists(path):
+        for record in iter_json_records(path):
+            value = tuple(record.get(field) for field in reused_fields)
+            dois = [extract_doi(record.get(field)) for field in doi_fields if record.get(field)]
+            papers_existing_in_prev_corpus.add(record.get("Title"), record.get("Source"), record.get("Year"), value, dois)
+    return papers_existing_in_prev_corpus
+
+
+# Look up a DBLP row in the prior corpus. Returns the reused (Abstract, Keywords) or None.
+def find_in_prior_corpus(obj, papers_existing_in_prev_corpus):
+    return papers_existing_in_prev_corpus.lookup(obj)
@@ -0,0 +1,36 @@
+# External packages
+import lxml.etree as ET
+import resource
+import sys
+
+
+# Record types (and their venue tags) that we are interested in.
+record_tags = ("article", "inproceedings", "incollection")
+venue_tags = ("journal", "booktitle")
+
+# All the top-level record types of the DBLP xml. Every one of them is freed once parsed, even the ones we skip.
+dblp_record_tags = ("article", "inproceedings", "proceedings", "book", "incollection", "phdthesis", "mastersthesis", "www", "data")
+
+
+# Stream the DBLP records of type <tags> from <source> (a path or a file-like object) with flat memory.
+# Each yielded element is only valid until the next one is requested: it is cleared, and detached from the root along with all its
+# preceding siblings, right after the caller is done with it.
+def iter_records(source, tags=record_tags, encoding=None):
+    context = ET.iterparse(source, events=("end",), tag=dblp_record_tags, encoding=encoding, recover=True, huge_tree=True)
+    for event, elem in context:
+        if elem.tag in tags:
+            yield elem
+        elem.clear(keep_tail=True)
+        parent = elem.getparent()
+        if parent is not None:
+            while elem.getprevious() is not None:
+                del parent[0]
+    del context
+
+
+# Peak resident set size of this process, in MB. `ru_maxrss` is in kilobytes on Linux but in bytes on MacOSX.
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
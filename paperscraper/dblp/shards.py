@@ -0,0 +1,96 @@
+# External packages
+from concurrent.futures import ProcessPoolExecutor
+import io
+import os
+import re
+
+# Internal modules
+from dblp.ingest import count_venue, record_to_row
+from dblp.records import dblp_record_tags, iter_records, record_tags
+from dblp.stream import fix_ee_ampersands
+
+
+# Every DBLP record starts on a new line, e.g., `<article mdate="..." key="...">`. The xml can therefore be cut right before any of them.
+regex_record_start = re.compile(rb'\n<(?:' + b'|'.join(tag.encode() for tag in dblp_record_tags) + rb')[\s>]')
+
+# How far to look ahead of a tentative shard boundary for the next record start.
+scan_size = 1024 * 1024
+
+
+def _find_record_start(f, offset, limit):
+    while offset < limit:
+        f.seek(offset)
+        data = f.read(min(scan_size, limit - offset) + 64)
+        match = regex_record_start.search(data)
+        if match:
+            return offset + match.start() + 1
+        offset += scan_size
+    return limit
+
+
+# The prolog (xml declaration, DOCTYPE and the opening <dblp> tag) of the DBLP xml at <path>. It is prepended to any standalone slice of
+# records so that lxml parses them (e.g., undefined entities) exactly as it does in a full pass.
+def read_prolog(path):
+    with open(path, "rb") as f:
+        first = _find_record_start(f, 0, os.path.getsize(path))
+        f.seek(0)
+        return f.read(first)
+
+
+# Split the (uncompressed) DBLP xml at <path> into byte ranges of roughly <shard_size> bytes, each one starting at a record boundary.
+# Returns the prolog (xml declaration, DOCTYPE and the opening <dblp> tag) which has to be prepended to every shard, and the list of
+# (start, end) offsets.
+def find_shards(path, shard_size):
+    size = os.path.getsize(path)
+    prolog = read_prolog(path)
+    first = len(prolog)
+    with open(path, "rb") as f:
+        f.seek(max(first, size - 4096))
+        tail = f.read()
+        end = size - len(tail) + tail.rfind(b"</dblp>") if b"</dblp>" in tail else size
+
+        boundaries = [first]
+        for target in range(first + shard_size, end, shard_size):
+            boundary = _find_record_start(f, max(target, boundaries[-1] + 1), end)
+            if boundary >= end:
+                break
+            boundaries.append(boundary)
+        boundaries.append(end)
+
+    return prolog, list(zip(boundaries[:-1], boundaries[1:]))
+
+
+# Parse ONE shard (in a worker process). Returns its venue counts and its filtered rows, in file order.
+def parse_shard(args):
+    path, prolog, start, end, interesting_venues = args
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = fix_ee_ampersands(f.read(end - start))
+
+    unique_sources = dict()
+    result_list = list()
+    for elem in iter_records(io.BytesIO(prolog + data + b"</dblp>\n"), tags=record_tags, encoding='UTF-8'):
+        count_venue(unique_sources, elem)
+        obj = record_to_row(elem, interesting_venues)
+        if obj is not None:
+            result_list.append(obj)
+    return unique_sources, result_list
+
+
+# Parse the (uncompressed, processed or raw) DBLP xml at <path> on <workers> processes.
+# Yields the per-shard (venue counts, rows) in the ORIGINAL order of the file so that the merged output is identical to a sequential run.
+def iter_shard_results(path, interesting_venues, workers, shard_size):
+    prolog, shards = find_shards(path, shard_size)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        tasks = [(path, prolog, start, end, interesting_venues) for start, end in shards]
+        for result in executor.map(parse_shard, tasks):
+            yield result
+
+
+# Merge the venue counts of a shard into <unique_sources>. The first occurrence (in file order) decides the child/elem tags.
+def merge_venue_counts(unique_sources, shard_sources):
+    for source, info in shard_sources.items():
+        if source not in unique_sources:
+            unique_sources[source] = info
+        else:
+            unique_sources[source]["count"] += info["count"]
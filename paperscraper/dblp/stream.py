@@ -0,0 +1,109 @@
+# External packages
+import gzip
+import os
+import re
+import sys
+import time
+
+
+# Matches a whole <ee></ee> element that contains at least one `&amp;`. Every `&amp;` inside it is replaced with the SPECIAL TAG `%26` in a single pass,
+# instead of re-running `(<ee>.*)&amp;(.*</ee>)` once per `&amp;` on the same line.
+regex_ee = re.compile(rb'<ee(?:\s[^>]*)?>[^<]*?&amp;[^<]*</ee>')
+
+# Default size of the chunks read from (and written to) disk.
+default_buffer_size = 16 * 1024 * 1024
+
+
+def fix_ee_ampersands(data):
+    return regex_ee.sub(lambda match: match.group(0).replace(b"&amp;", b"%26"), data)
+
+
+def is_gzip(path):
+    with open(path, "rb") as f:
+        return f.read(2) == b"\x1f\x8b"
+
+
+# Open the DBLP xml for reading as bytes. Handles `.gz` files (as DBLP ships them) and "-" for stdin.
+def open_dblp(path):
+    if path == "-":
+        return sys.stdin.buffer
+    if is_gzip(path):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+# Only a plain (uncompressed) file on disk can be read at random byte offsets, e.g., to split it into shards or to index it.
+def is_seekable(path):
+    return path != "-" and os.path.isfile(path) and not is_gzip(path)
+
+
+# Open the output for writing as bytes. Compresses if the path ends with `.gz`; "-" writes to stdout.
+def open_output(path, compresslevel=1):
+    if path == "-":
+        return sys.stdout.buffer
+    if path.endswith(".gz"):
+        return gzip.open(path, "wb", compresslevel=compresslevel)
+    return open(path, "wb")
+
+
+# File-like wrapper that fixes the <ee></ee> tags on the fly. It can be handed directly to lxml (e.g., ET.iterparse) so that no processed copy
+# of DBLP has to be written to disk. Chunks are cut at the last newline so that an <ee></ee> element is never split across two chunks.
+class EeFixingReader:
+    def __init__(self, raw, buffer_size=default_buffer_size):
+        self.raw = raw
+        self.buffer_size = buffer_size
+        self.bytes_read = 0
+        self._carry = b""
+        self._pending = b""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        chunk = self.raw.read(self.buffer_size)
+        self.bytes_read += len(chunk)
+        if not chunk:
+            self._eof = True
+            data, self._carry = self._carry, b""
+        else:
+            data = self._carry + chunk
+            cut = data.rfind(b"\n") + 1
+            if cut == 0:
+                self._carry = data
+                return
+            data, self._carry = data[:cut], data[cut:]
+        self._pending = self._pending[self._pos:] + fix_ee_ampersands(data)
+        self._pos = 0
+
+    def read(self, size=-1):
+        while not self._eof and (size < 0 or len(self._pending) - self._pos < size):
+            self._fill()
+        if size < 0:
+            size = len(self._pending) - self._pos
+        # Hand out slices of the fixed chunk without re-copying the remainder on every call; lxml reads in small blocks.
+        data = self._pending[self._pos:self._pos + size]
+        self._pos += len(data)
+        return data
+
+    def close(self):
+        self.raw.close()
+
+
+# Stream <path_in> through the <ee></ee> fix into <path_out>. Returns (uncompressed bytes read, seconds taken).
+def preprocess(path_in, path_out, buffer_size=default_buffer_size, compresslevel=1):
+    start = time.perf_counter()
+    reader = EeFixingReader(open_dblp(path_in), buffer_size=buffer_size)
+    out = open_output(path_out, compresslevel=compresslevel)
+    try:
+        while True:
+            data = reader.read(buffer_size)
+            if not data:
+                break
+            out.write(data)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+        else:
+            out.flush()
+        if reader.raw is not sys.stdin.buffer:
+            reader.close()
+    return reader.bytes_read, time.perf_counter() - start
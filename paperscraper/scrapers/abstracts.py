@@ -1,188 +1,181 @@
 import re
 
-
-def acm_digital_library(soup):
+from scrapers.dom import classes_are, first, has_class, string, text, with_string, xpath
+
+
+# Selectors, compiled once (see scrapers/dom.py).
+any_p = xpath(".//p")
+next_p = xpath("(descendant::p | following::p)[1]")
+next_div = xpath("(descendant::div | following::div)[1]")
+
+acm_abstract_div = xpath("//div[" + classes_are("abstractSection abstractInFull") + "]")
+gi_h3s = xpath("//h3")
+ieee_abstract_div = xpath("//div[" + has_class("abstract-text") + "]")
+ieee_strong = xpath(".//strong")
+ieee_article_div = xpath("//div[" + classes_are("article-content mt-lg") + "]")
+ieee_h5s = xpath("//h5")
+scitepress_abstract_span = xpath("//span[@id='ContentPlaceHolder1_LinkPaperPage_LinkPaperContent_LabelAbstract']")
+scienceopen_headers = xpath("//header[" + has_class("so-layout-section-header") + "]")
+scienceopen_h3 = xpath(".//h3[" + has_class("so-layout-section-title") + "]")
+scienceopen_next_div = xpath("(descendant::div[" + has_class("so-d") + "] | following::div[" + has_class("so-d") + "])[1]")
+scienceopen_p = xpath(".//p[" + has_class("first") + "]")
+eurographics_abstract_div = xpath("//div[" + classes_are("simple-item-view-description item-page-field-wrapper table") + "]")
+eurographics_h5 = xpath(".//h5")
+springer_v1_abstract_div = xpath("//div[" + has_class("c-article-section__content") + "]")
+springer_v2_abstract_section = xpath("//section[" + has_class("Abstract") + "]")
+springer_v2_p = xpath(".//p[" + has_class("Para") + "]")
+springer_v2_h3 = xpath(".//h3")
+springer_v2_h2 = xpath(".//h2")
+wiley_abstract_div = xpath("//div[" + has_class("article-section__content") + "]")
+dagstuhl_abstract_div = xpath("//div[@itemprop='about']")
+cogsci_abstract_p = xpath("//p[@id='abstract']")
+cogsci_abstract_span = xpath("//span[" + has_class("subAbstract") + "]")
+cogsci_blockquotes = xpath("//blockquote")
+child_elements = xpath("*")
+aaai_abstract_div = xpath("//div[@id='abstract']")
+
+regex_abstract = re.compile('Abstract')
+
+
+def acm_digital_library(doc):
     try:
-        abstract_parent_div = soup.find('div', class_="abstractSection abstractInFull")
-        abstract_p = abstract_parent_div.find('p')
-        return abstract_p.text
+        abstract_parent_div = first(acm_abstract_div, doc)
+        abstract_p = first(any_p, abstract_parent_div)
+        return text(abstract_p)
     except Exception as e:
         print(e)
     return None
 
 
-def graphics_interface_proceedings(soup):
+def graphics_interface_proceedings(doc):
     try:
-        abstract_h3 = soup.find("h3", text=re.compile('Abstract'))
-        abstract_p = abstract_h3.find_next('p')
-        return abstract_p.text
+        abstract_h3 = with_string(gi_h3s(doc), regex_abstract)
+        abstract_p = first(next_p, abstract_h3)
+        return text(abstract_p)
     except Exception as e:
         pass
     return None
 
 
-def ieee_explore(soup):
+def ieee_explore(doc):
     try:
-        abstract_parent_div = soup.find('div', class_="abstract-text")
-        if abstract_parent_div:
-            abstract_div = abstract_parent_div.find('strong').find_next('div')
+        abstract_parent_div = first(ieee_abstract_div, doc)
+        if abstract_parent_div is not None:
+            abstract_div = first(next_div, first(ieee_strong, abstract_parent_div))
         else:
-            abstract_div = soup.find('div', class_="article-content mt-lg")
+            abstract_div = first(ieee_article_div, doc)
             if abstract_div is None:
-                abstract_div = soup.findAll('h5', text='Abstract')[0].find_next('div')
-        return abstract_div.text
+                abstract_div = first(next_div, [h5 for h5 in ieee_h5s(doc) if string(h5) == 'Abstract'][0])
+        return text(abstract_div)
     except Exception as e:
         print(e)
     return None
 
 
-def scitepress(soup):
+def scitepress(doc):
     try:
-        abstract_span = soup.find('span', id="ContentPlaceHolder1_LinkPaperPage_LinkPaperContent_LabelAbstract")
-        return abstract_span.text
+        abstract_span = first(scitepress_abstract_span, doc)
+        return text(abstract_span)
     except Exception as e:
         print(e)
     return None
 
 
-def scienceopen(soup):
+def scienceopen(doc):
     try:
-        for header in soup.find_all('header', class_="so-layout-section-header"):
-            h3 = header.find("h3", class_="so-layout-section-title")
-            if "Abstract" in h3.text:
-                abstract_div = header.find_next("div", class_="so-d")
-                abstract_p = abstract_div.find('p', class_="first")
-                return abstract_p.text
+        for header in scienceopen_headers(doc):
+            h3 = first(scienceopen_h3, header)
+            if "Abstract" in text(h3):
+                abstract_div = first(scienceopen_next_div, header)
+                abstract_p = first(scienceopen_p, abstract_div)
+                return text(abstract_p)
     except Exception as e:
         print(e)
     return None
 
 
-def eurographics_digital_library(soup):
+def eurographics_digital_library(doc):
     try:
-        abstract_parent_div = soup.find('div', class_="simple-item-view-description item-page-field-wrapper table")
-        abstract_div = abstract_parent_div.find('h5').find_next('div')
-        return abstract_div.text
+        abstract_parent_div = first(eurographics_abstract_div, doc)
+        abstract_div = first(next_div, first(eurographics_h5, abstract_parent_div))
+        return text(abstract_div)
     except Exception as e:
         print(e)
     return None
 
 
-def springer_v1(soup):
+def springer_v1(doc):
     try:
-        abstract_parent_div = soup.find('div', class_="c-article-section__content")
-        abstract_p = abstract_parent_div.find('p')
-        return abstract_p.text
+        abstract_parent_div = first(springer_v1_abstract_div, doc)
+        abstract_p = first(any_p, abstract_parent_div)
+        return text(abstract_p)
     except Exception as e:
         print(e)
     return None
 
 
-def springer_v2(soup):
+def springer_v2(doc):
     try:
-        abstract_parent_section = soup.find('section', class_="Abstract")
-        abstract_p = abstract_parent_section.find("p", class_="Para")
+        abstract_parent_section = first(springer_v2_abstract_section, doc)
+        abstract_p = first(springer_v2_p, abstract_parent_section)
         if abstract_p is None:
-            nearest_tag = abstract_parent_section.find('h3')
+            nearest_tag = first(springer_v2_h3, abstract_parent_section)
             if nearest_tag is None:
-                nearest_tag = abstract_parent_section.find('h2')
-            abstract_p = nearest_tag.find_next('p')
-        return abstract_p.text
+                nearest_tag = first(springer_v2_h2, abstract_parent_section)
+            abstract_p = first(next_p, nearest_tag)
+        return text(abstract_p)
     except Exception as e:
         print(e)
     return None
 
 
-def wiley_online_library(soup):
+def wiley_online_library(doc):
     try:
-        abstract_parent_section = soup.find('div', class_="article-section__content")
-        abstract_p = abstract_parent_section.find('p')
-        return abstract_p.text
+        abstract_parent_section = first(wiley_abstract_div, doc)
+        abstract_p = first(any_p, abstract_parent_section)
+        return text(abstract_p)
     except Exception as e:
         print(e)
     return None
 
 
-def dagstuhl(soup):
+def dagstuhl(doc):
     try:
-        abstract_div = soup.find('div', itemprop="about")
+        abstract_div = first(dagstuhl_abstract_div, doc)
         if abstract_div is not None:
-            if abstract_div.text.strip().startswith("Abstract"):
-                return abstract_div.text.strip()[len("Abstract"):]
+            if text(abstract_div).strip().startswith("Abstract"):
+                return text(abstract_div).strip()[len("Abstract"):]
     except Exception as e:
         print(e)
     return None
 
 
-def cogsci(soup):
+def cogsci(doc):
     try:
-        abstract_p = soup.find('p', id="abstract")
+        abstract_p = first(cogsci_abstract_p, doc)
         if abstract_p is not None:
-            return abstract_p.text
+            return text(abstract_p)
         else:
-            abstract_span = soup.find('span', class_="subAbstract")
+            abstract_span = first(cogsci_abstract_span, doc)
             if abstract_span is not None:
-                abstract = abstract_span.text
+                abstract = text(abstract_span)
                 if abstract.startswith("Abstract"):
                     return abstract.replace("Abstract", "", 1)
                 return abstract
             else:
-                blockquotes = soup.findAll('blockquote')
-                if blockquotes is not None:
-                    for blockquote in blockquotes:
-                        if len(blockquote.findChildren()) == 0:
-                            return blockquote.text
+                for blockquote in cogsci_blockquotes(doc):
+                    if len(child_elements(blockquote)) == 0:
+                        return text(blockquote)
     except Exception as e:
         print(e)
     return None
 
 
-def aaai(soup):
+def aaai(doc):
     try:
-        abstract_div = soup.find("div", id="abstract")
-        if abstract_div:
-            return abstract_div.find("p").find_next("p").text
+        abstract_div = first(aaai_abstract_div, doc)
+        if abstract_div is not None:
+            return text(first(next_p, first(any_p, abstract_div)))
     except Exception as e:
         print(e)
     return None
-
-
-def get_abstract(publisher, soup):
-    abstract = None
-    if publisher == "acm_digital_library":
-        abstract = acm_digital_library(soup)
-
-    elif publisher == "graphics_interface_proceedings":
-        abstract = graphics_interface_proceedings(soup)
-
-    elif publisher == "ieee_explore":
-        abstract = ieee_explore(soup)
-
-    elif publisher == "cogsci":
-        abstract = cogsci(soup)
-
-    elif publisher == "springer_v1":
-        abstract = springer_v1(soup)
-
-    elif publisher == "springer_v2":
-        abstract = springer_v2(soup)
-
-    elif publisher == "scitepress":
-        abstract = scitepress(soup)
-
-    elif publisher == "scienceopen":
-        abstract = scienceopen(soup)
-
-    elif publisher == "eurographics_digital_library":
-        abstract = eurographics_digital_library(soup)
-
-    elif publisher == "wiley_online_library":
-        abstract = wiley_online_library(soup)
-
-    elif publisher == "dagstuhl":
-        abstract = dagstuhl(soup)
-
-    elif publisher == "aaai":
-        abstract = aaai(soup)
-
-    return abstract
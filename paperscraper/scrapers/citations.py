@@ -1,157 +1,128 @@
 import re
 
-def ieee_explore(soup):
+from lxml import etree
+
+from scrapers.dom import classes_are, first, has_class, text, with_string, xpath
+
+
+# Selectors, compiled once (see scrapers/dom.py).
+next_div = xpath("(descendant::div | following::div)[1]")
+
+ieee_metrics_div = xpath("//div[" + has_class("document-banner-metric-container") + "]")
+ieee_metric_buttons = xpath(".//button[" + has_class("document-banner-metric") + "]")
+ieee_metric_count_div = xpath(".//div[" + has_class("document-banner-metric-count") + "]")
+acm_footer_div = xpath("//div[" + has_class("issue-item__footer") + "]")
+acm_footer_info_div = xpath(".//div[" + has_class("issue-item__footer-info") + "]")
+acm_tooltip_div = xpath(".//div[" + has_class("tooltip") + "]")
+acm_inline_ul = xpath(".//ul[" + has_class("rlist--inline") + "]")
+acm_lis = xpath(".//li")
+acm_citation_span = xpath(".//span[" + has_class("citation") + "]")
+acm_spans = xpath(".//span")
+springer_v2_chapter_citations_span = xpath("//span[@id='chaptercitations-count-number']")
+springer_v2_book_citations_span = xpath("//span[@id='bookcitations-count-number']")
+springer_v1_metrics_ul = xpath("//ul[" + classes_are("c-article-metrics-bar u-list-reset") + "]")
+springer_v1_metric_lis = xpath(".//li[" + has_class("c-article-metrics-bar__item") + "]")
+springer_v1_count_p = xpath(".//p[" + has_class("c-article-metrics-bar__count") + "]")
+springer_v1_label_span = xpath(".//span[" + has_class("c-article-metrics-bar__label") + "]")
+wiley_cited_by_div = xpath("//div[" + has_class("cited-by-count") + "]")
+wiley_span = xpath(".//span")
+wiley_a = xpath(".//a")
+scienceopen_label_divs = xpath("//div[" + has_class("so-stats2-label") + "]")
+scienceopen_previous_num_div = xpath("(preceding::div[" + has_class("so-stats2-num") + "] | ancestor::div[" + has_class("so-stats2-num") + "])[last()]")
+
+regex_cited_by = re.compile('cited by')
+
+
+# The first child (text or element) of <elem> (like BeautifulSoup's `.contents[0]`).
+def _first_content(elem):
+    if elem.text:
+        return elem.text
+    return etree.tostring(elem[0], method="html", encoding="unicode", with_tail=False)
+
+
+def ieee_explore(doc):
     try:
         # Check if it is indeed the Citation count and NOT the number of Full Text Views
-        parent_div = soup.find("div", class_="document-banner-metric-container")
-        if parent_div:
-            for citation_parent_btn in parent_div.findChildren('button', class_="document-banner-metric"):
-                citation_div = citation_parent_btn.find('div', class_="document-banner-metric-count")
+        parent_div = first(ieee_metrics_div, doc)
+        if parent_div is not None:
+            for citation_parent_btn in ieee_metric_buttons(parent_div):
+                citation_div = first(ieee_metric_count_div, citation_parent_btn)
                 # Check if it is indeed the Citation count and NOT the number of Full Text Views
-                if citation_div:
-                    paper_text_div = citation_div.find_next('div')
-                    if paper_text_div.text == "Paper":
-                        citation_text_div = paper_text_div.find_next('div')
-                        if citation_text_div.text in ["Citation", "Citations"]:
+                if citation_div is not None:
+                    paper_text_div = first(next_div, citation_div)
+                    if text(paper_text_div) == "Paper":
+                        citation_text_div = first(next_div, paper_text_div)
+                        if text(citation_text_div) in ["Citation", "Citations"]:
                             # Now, it's confirmed that this button is indeed the citation button
-                            citation_count = citation_div.text
+                            citation_count = text(citation_div)
                             return str(citation_count)
     except Exception as e:
         print(e)
     return None
 
 
-def eurographics_digital_library(soup):
-    return None
-
-
-def acm_digital_library(soup):
+def acm_digital_library(doc):
     try:
-        grandparent_ul = soup\
-            .find("div", class_="issue-item__footer")\
-            .find("div", class_="issue-item__footer-info")\
-            .find("div", class_="tooltip")\
-            .find('ul', class_="rlist--inline")
-        if grandparent_ul:
-            for parent_li in grandparent_ul.findChildren('li'):
-                citation_span = parent_li.find("span", class_="citation")
-                if citation_span:
-                    for citation_child in citation_span.findChildren("span"):
-                        return str(citation_child.text)
+        grandparent_ul = first(acm_inline_ul, first(acm_tooltip_div, first(acm_footer_info_div, first(acm_footer_div, doc))))
+        if grandparent_ul is not None:
+            for parent_li in acm_lis(grandparent_ul):
+                citation_span = first(acm_citation_span, parent_li)
+                if citation_span is not None:
+                    for citation_child in acm_spans(citation_span):
+                        return str(text(citation_child))
     except Exception as e:
         print(e)
 
     return None
 
 
-def graphics_interface_proceedings(soup):
-    return None
-
-
-def springer_v2(soup):
+def springer_v2(doc):
     try:
-        citation_span = soup.find("span", id="chaptercitations-count-number")
-        if citation_span:
-            return str(citation_span.text)
+        citation_span = first(springer_v2_chapter_citations_span, doc)
+        if citation_span is not None:
+            return str(text(citation_span))
         else:
-            citation_span = soup.find("span", id="bookcitations-count-number")
-            if citation_span:
-                return str(citation_span.text)
+            citation_span = first(springer_v2_book_citations_span, doc)
+            if citation_span is not None:
+                return str(text(citation_span))
     except Exception as e:
         print(e)
     return None
 
 
-def springer_v1(soup):
+def springer_v1(doc):
     try:
-        citation_ul = soup.find("ul", class_="c-article-metrics-bar u-list-reset")
-        if citation_ul:
-            for citation_parent_li in citation_ul.findChildren('li', class_="c-article-metrics-bar__item"):
-                citation_parent_p = citation_parent_li.find('p', class_="c-article-metrics-bar__count")
-                if citation_parent_p:
-                    label_span = citation_parent_p.find('span', class_="c-article-metrics-bar__label")
-                    if label_span.text in ["Citation", "Citations"]:
-                        return str(citation_parent_p.contents[0])
+        citation_ul = first(springer_v1_metrics_ul, doc)
+        if citation_ul is not None:
+            for citation_parent_li in springer_v1_metric_lis(citation_ul):
+                citation_parent_p = first(springer_v1_count_p, citation_parent_li)
+                if citation_parent_p is not None:
+                    label_span = first(springer_v1_label_span, citation_parent_p)
+                    if text(label_span) in ["Citation", "Citations"]:
+                        return str(_first_content(citation_parent_p))
     except Exception as e:
         print(e)
     return None
 
 
-def wiley_online_library(soup):
+def wiley_online_library(doc):
     try:
-        parent_div = soup.find('div', class_="cited-by-count")
-        citation_span = parent_div.find('span')
-        citation_a = citation_span.find('a')
-        return str(citation_a.text)
+        parent_div = first(wiley_cited_by_div, doc)
+        citation_span = first(wiley_span, parent_div)
+        citation_a = first(wiley_a, citation_span)
+        return str(text(citation_a))
     except Exception as e:
         print(e)
     return None
 
 
-def cogsci(soup):
-    return None
-
-
-def scitepress(soup):
-    return None
-
-
-def dagstuhl(soup):
-    return None
-
-
-def scienceopen(soup):
+def scienceopen(doc):
     try:
-        citation_label = soup.find("div", class_="so-stats2-label", text=re.compile('cited by'))
-        if citation_label:
-            citation_div = citation_label.find_previous("div", class_="so-stats2-num")
-            return citation_div.text
+        citation_label = with_string(scienceopen_label_divs(doc), regex_cited_by)
+        if citation_label is not None:
+            citation_div = first(scienceopen_previous_num_div, citation_label)
+            return text(citation_div)
     except Exception as e:
         print(e)
 
     return None
-
-
-def aaai(soup):
-    return None
-
-def get_citation_count(publisher, soup):
-    citation_count = None
-
-    if publisher == "acm_digital_library":
-        citation_count = acm_digital_library(soup)
-
-    elif publisher == "graphics_interface_proceedings":
-        citation_count = graphics_interface_proceedings(soup)
-
-    elif publisher == "ieee_explore":
-        citation_count = ieee_explore(soup)
-
-    elif publisher == "cogsci":
-        citation_count = cogsci(soup)
-
-    elif publisher == "springer_v1":
-        citation_count = springer_v1(soup)
-
-    elif publisher == "springer_v2":
-        citation_count = springer_v2(soup)
-
-    elif publisher == "scitepress":
-        citation_count = scitepress(soup)
-
-    elif publisher == "scienceopen":
-        citation_count = scienceopen(soup)
-
-    elif publisher == "eurographics_digital_library":
-        citation_count = eurographics_digital_library(soup)
-
-    elif publisher == "wiley_online_library":
-        citation_count = wiley_online_library(soup)
-
-    elif publisher == "dagstuhl":
-        citation_count = dagstuhl(soup)
-
-    elif publisher == "aaai":
-        citation_count = aaai(soup)
-
-    return citation_count
@@ -0,0 +1,81 @@
+# External packages
+from lxml import etree
+import lxml.html
+
+
+# Helpers for the extractors (see scrapers/): pages are parsed with lxml.html, and the extractors' selectors are XPath expressions compiled
+# ONCE at import time (with <xpath>). The helpers below reproduce the BeautifulSoup semantics the extractors were written against.
+
+parser = lxml.html.HTMLParser(encoding="utf-8")
+
+
+# Parse a page (str or bytes) into an lxml.html document.
+def parse_html(page_source):
+    if isinstance(page_source, str):
+        page_source = page_source.encode("utf-8")
+    try:
+        return lxml.html.document_fromstring(page_source, parser)
+    except etree.ParserError:
+        # An empty page.
+        return lxml.html.document_fromstring(b"<html></html>", parser)
+
+
+def xpath(expression):
+    return etree.XPath(expression)
+
+
+# XPath predicate for elements with <name> among their classes (like BeautifulSoup's `class_="name"`).
+def has_class(name):
+    return "contains(concat(' ', normalize-space(@class), ' '), ' " + name + " ')"
+
+
+# XPath predicate for elements whose classes are exactly <names> (like BeautifulSoup's `class_="name1 name2"`).
+def classes_are(names):
+    return "normalize-space(@class)='" + names + "'"
+
+
+# The first element that <path> selects from <elem>, or None. Like BeautifulSoup, a missing <elem> raises.
+def first(path, elem):
+    if elem is None:
+        raise AttributeError("'NoneType' object has no attribute 'find'")
+    found = path(elem)
+    return found[0] if len(found) > 0 else None
+
+
+_all_text = xpath("descendant-or-self::text()[not(ancestor::script or ancestor::style or ancestor::template)]")
+
+
+# All the text of <elem> (like BeautifulSoup's `.text`).
+def text(elem):
+    if elem is None:
+        raise AttributeError("'NoneType' object has no attribute 'text'")
+    return "".join(_all_text(elem))
+
+
+# The only string of <elem> (or of its only child, recursively), or None (like BeautifulSoup's `.string`).
+def string(elem):
+    nodes = [elem.text] if elem.text else []
+    for child in elem:
+        nodes.append(child)
+        if child.tail:
+            nodes.append(child.tail)
+    if len(nodes) != 1:
+        return None
+    node = nodes[0]
+    if isinstance(node, str):
+        return str(node)
+    if not isinstance(node.tag, str):
+        # A comment
+        return node.text
+    return string(node)
+
+
+# The first element in <elements> whose only string (see <string>) is <value> (a str) or matches it (a compiled regex).
+def with_string(elements, value):
+    for elem in elements:
+        elem_string = string(elem)
+        if elem_string is None:
+            continue
+        if (value.search(elem_string) is not None) if hasattr(value, "search") else (elem_string == value):
+            return elem
+    return None
@@ -0,0 +1,38 @@
+# Internal modules
+from scrapers.registry import publishers
+
+
+# Publishers that show the KEYWORDS on a different page than the landing page, with the suffix that leads there from the landing page's URL.
+# All the other publishers' keywords are extracted from the landing page itself (see scrapers/registry.py).
+keywords_pages = {publisher: entry["keywords_page"] for publisher, entry in publishers.items() if "keywords_page" in entry}
+
+
+# The <fields> that can be extracted from the landing page of <publisher>.
+def landing_page_fields(publisher, fields):
+    return [field for field in fields if field != "keywords" or publisher not in keywords_pages]
+
+
+# The <fields> that are taken from the metadata embedded in the landing page of <publisher> (see scrapers/metadata.py), if it has them.
+def metadata_fields(publisher, fields):
+    return [field for field in fields if field in publishers.get(publisher, dict()).get("metadata", [])]
+
+
+# The <fields> that have an in-page extractor for <publisher> (see scrapers/in_page.py).
+def in_page_fields(publisher, fields):
+    return [field for field in fields if field in publishers.get(publisher, dict()).get("in_page", dict())]
+
+
+# Extract the <fields> (e.g., ["abstract", "citation_count", "keywords"]) of a paper of <publisher> from ONE parsed page (<doc>, see scrapers/dom.py).
+# Returns field -> value, or None if the field was not found (or the publisher does not provide it, see scrapers/registry.py).
+def extract_all(publisher, doc, fields):
+    entry = publishers.get(publisher, dict())
+    values = dict()
+    for field in fields:
+        try:
+            values[field] = entry[field](doc) if field in entry else None
+        except Exception as e:
+            values[field] = None
+        # An empty list of keywords counts as not found.
+        if field == "keywords" and values[field] is not None and len(values[field]) == 0:
+            values[field] = None
+    return values
@@ -0,0 +1,164 @@
+# External packages
+import json
+
+
+# The extractors of scrapers/abstracts.py, citations.py and keywords.py, ported to JavaScript so that they run INSIDE the browser's page
+# (see <extraction_script>): only a few hundred bytes of results cross the WebDriver wire instead of the whole page_source.
+# Each is the body of a function of no argument that returns the field's value, or throws / returns null if it is not on the page.
+# They are declared per publisher with "in_page" in scrapers/registry.py, for the publishers that are scraped with the browser.
+
+# Helpers shared by the extractors; they mirror scrapers/dom.py.
+helpers = """
+function text(e) {
+    if (!e) throw new Error("not found");
+    var s = "", walker = document.createTreeWalker(e, NodeFilter.SHOW_TEXT);
+    while (walker.nextNode()) {
+        if (!walker.currentNode.parentNode.closest("script, style, template")) s += walker.currentNode.nodeValue;
+    }
+    return s;
+}
+function one(selector, e) {
+    if (!e) throw new Error("not found");
+    return e.querySelector(selector);
+}
+function all(selector, e) {
+    if (!e) throw new Error("not found");
+    return Array.prototype.slice.call(e.querySelectorAll(selector));
+}
+function classesAre(tag, classes) {
+    return all(tag, document).filter(function (e) { return (e.getAttribute("class") || "").trim().split(/\\s+/).join(" ") === classes; })[0] || null;
+}
+function children(tag, e) {
+    if (!e) throw new Error("not found");
+    return Array.prototype.filter.call(e.children, function (c) { return c.tagName.toLowerCase() === tag; });
+}
+function next(tag, e) {
+    if (!e) throw new Error("not found");
+    var candidates = document.getElementsByTagName(tag);
+    for (var i = 0; i < candidates.length; i++) {
+        if (e.compareDocumentPosition(candidates[i]) & Node.DOCUMENT_POSITION_FOLLOWING) return candidates[i];
+    }
+    return null;
+}
+function unique(values) {
+    return values.filter(function (v, i) { return values.indexOf(v) === i; });
+}
+function clean(s) {
+    return s.replace(/[\\n\\r\\t]/g, "");
+}
+function categories(s) {
+    ["CCS Concepts", "Categories and Subject Descriptors", "Categories and subject descriptors", "Categories and Subject Descriptors (according to ACM CCS)", "according to ACM CCS"].forEach(function (r) { s = s.split(r).join(""); });
+    var bracketed = s.match(/\\[(.*?)\\]/g);
+    if (bracketed) return bracketed.map(function (b) { return b.slice(1, -1); });
+    return s.replace(/•(.*)→(.*)/g, "$1;$2").split(/,|:|;/);
+}
+"""
+
+acm_digital_library = {
+    "abstract": """
+        return text(one("p", classesAre("div", "abstractSection abstractInFull")));
+    """,
+    "citation_count": """
+        var ul = one("ul.rlist--inline", one("div.tooltip", one("div.issue-item__footer-info", document.querySelector("div.issue-item__footer"))));
+        if (!ul) return null;
+        var lis = all("li", ul);
+        for (var i = 0; i < lis.length; i++) {
+            var span = one("span.citation", lis[i]);
+            if (span && one("span", span)) return text(one("span", span));
+        }
+        return null;
+    """,
+    "keywords": """
+        return unique(all("div", classesAre("ol", "rlist organizational-chart")).map(function (div) { return clean(text(div).split(",")[0]); }));
+    """,
+}
+
+ieee_explore = {
+    "abstract": """
+        var parent = document.querySelector("div.abstract-text"), div;
+        if (parent) {
+            div = next("div", one("strong", parent));
+        } else {
+            div = classesAre("div", "article-content mt-lg");
+            if (!div) div = next("div", all("h5", document).filter(function (h5) { return h5.childNodes.length === 1 && h5.textContent === "Abstract"; })[0]);
+        }
+        return text(div);
+    """,
+    "citation_count": """
+        var parent = document.querySelector("div.document-banner-metric-container");
+        if (!parent) return null;
+        var buttons = all("button.document-banner-metric", parent);
+        for (var i = 0; i < buttons.length; i++) {
+            var count = one("div.document-banner-metric-count", buttons[i]);
+            if (count) {
+                var paper = next("div", count);
+                if (text(paper) === "Paper" && ["Citation", "Citations"].indexOf(text(next("div", paper))) >= 0) return text(count);
+            }
+        }
+        return null;
+    """,
+    "keywords": """
+        var keywords = [];
+        children("li", classesAre("ul", "doc-keywords-list stats-keywords-list")).filter(function (li) { return li.classList.contains("doc-keywords-list-item"); }).forEach(function (group) {
+            if (["IEEE Keywords", "INSPEC: Controlled Indexing", "INSPEC: Non-Controlled Indexing", "MeSH Terms"].indexOf(text(one("strong", group))) >= 0) {
+                children("li", one("ul", group)).forEach(function (li) {
+                    var a = one("a.stats-keywords-list-item", li);
+                    keywords.push(clean(text(a ? a : li).split(",")[0]));
+                });
+            }
+        });
+        return unique(keywords);
+    """,
+}
+
+wiley_online_library = {
+    "abstract": """
+        return text(one("p", document.querySelector("div.article-section__content")));
+    """,
+    "citation_count": """
+        return text(one("a", one("span", document.querySelector("div.cited-by-count"))));
+    """,
+    "keywords": """
+        var keywords = [];
+        all("li", one("ul", document.querySelector("section.keywords"))).forEach(function (li) {
+            keywords = keywords.concat(categories(text(one("a", li))));
+        });
+        return unique(keywords);
+    """,
+}
+
+
+# ONE script that runs the in-page extractors (field -> JavaScript, see above) and returns their values as a JSON string.
+def extraction_script(extractors):
+    functions = ",\n".join(json.dumps(field) + ": function () {" + body + "}" for field, body in extractors.items())
+    return helpers + """
+var extractors = {""" + functions + """};
+var values = {};
+for (var field in extractors) {
+    try {
+        values[field] = extractors[field]();
+    } catch (e) {
+        values[field] = null;
+    }
+    if (values[field] !== null && values[field] !== undefined && typeof values[field] !== "string" && !Array.isArray(values[field])) values[field] = String(values[field]);
+}
+return JSON.stringify(values);
+"""
+
+
+# The field -> value of the <fields> from the JSON that <extraction_script> returned, with None if not found (like <extract_all> in
+# scrapers/extract.py).
+def parse_values(result, fields):
+    values = json.loads(result)
+    for field in fields:
+        values[field] = values.get(field)
+        # An empty list of keywords counts as not found.
+        if field == "keywords" and values[field] is not None and len(values[field]) == 0:
+            values[field] = None
+    return values
+
+
+# Run the in-page extractors of the <fields> of a publisher (field -> JavaScript, see "in_page" in scrapers/registry.py) in the page that
+# <driver> shows, with ONE execute_script call. Returns field -> value.
+def extract_in_page(driver, extractors, fields):
+    return parse_values(driver.execute_script(extraction_script({field: extractors[field] for field in fields})), fields)
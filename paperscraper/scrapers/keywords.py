@@ -1,15 +1,49 @@
 import re
 
+from scrapers.dom import classes_are, first, has_class, text, with_string, xpath
+
 regex = re.compile(r'[\n\r\t]')
 
 
-def acm_digital_library(soup):
+# Selectors, compiled once (see scrapers/dom.py).
+next_td = xpath("(descendant::td | following::td)[1]")
+
+acm_keywords_ol = xpath("//ol[" + classes_are("rlist organizational-chart") + "]")
+acm_divs = xpath(".//div")
+ieee_keywords_ul = xpath("//ul[" + classes_are("doc-keywords-list stats-keywords-list") + "]")
+ieee_keywords_group_lis = xpath("li[" + has_class("doc-keywords-list-item") + "]")
+ieee_strong = xpath(".//strong")
+ieee_ul = xpath(".//ul")
+child_lis = xpath("li")
+ieee_keyword_a = xpath(".//a[" + has_class("stats-keywords-list-item") + "]")
+eurographics_detail_table = xpath("//table[" + has_class("detailtable") + "]")
+eurographics_tbody = xpath(".//tbody")
+eurographics_trs = xpath(".//tr")
+eurographics_label_td = xpath(".//td[" + has_class("label-cell") + "]")
+eurographics_value_td = xpath(".//td[" + has_class("word-break") + "]")
+springer_v2_keywords_div = xpath("//div[" + has_class("KeywordGroup") + "]")
+springer_v2_keyword_spans = xpath(".//span[" + has_class("Keyword") + "]")
+dagstuhl_bs = xpath("//b")
+dagstuhl_font = xpath(".//font")
+springer_v1_subjects_ul = xpath("//ul[" + has_class("c-article-subject-list") + "]")
+springer_v1_subject_lis = xpath(".//li[" + has_class("c-article-subject-list__subject") + "]")
+springer_v1_span = xpath(".//span")
+wiley_keywords_section = xpath("//section[" + has_class("keywords") + "]")
+wiley_ul = xpath(".//ul")
+wiley_lis = xpath(".//li")
+wiley_a = xpath(".//a")
+scitepress_keywords_span = xpath("//span[@id='ContentPlaceHolder1_LinkPaperPage_LinkPaperContent_LabelPublicationDetailKeywords']")
+scienceopen_label_spans = xpath("//span[" + has_class("so-metadata-label") + "]")
+scienceopen_next_as = xpath("following-sibling::a")
+
+
+def acm_digital_library(doc):
     try:
         keywords = set()
-        keywords_parent_ol = soup.find('ol', class_="rlist organizational-chart")
-        keywords_divs = keywords_parent_ol.findChildren('div', recursive=True)
+        keywords_parent_ol = first(acm_keywords_ol, doc)
+        keywords_divs = acm_divs(keywords_parent_ol)
         for kw_parent in keywords_divs:
-            kw = kw_parent.text
+            kw = text(kw_parent)
             keywords.add(regex.sub("", kw.split(",")[0]))
         return list(keywords)
     except Exception as e:
@@ -17,45 +51,41 @@ def acm_digital_library(soup):
     return None
 
 
-def graphics_interface_proceedings(soup):
-    return None
-
-
-def ieee_explore(soup):
+def ieee_explore(doc):
     try:
         keywords = set()
-        ggp_ul = soup.find('ul', class_="doc-keywords-list stats-keywords-list")
-        gp_li = ggp_ul.findChildren("li", class_="doc-keywords-list-item", recursive=False)
+        ggp_ul = first(ieee_keywords_ul, doc)
+        gp_li = ieee_keywords_group_lis(ggp_ul)
         for p_li in gp_li:
-            if p_li.find('strong').text in ["IEEE Keywords", "INSPEC: Controlled Indexing", "INSPEC: Non-Controlled Indexing", "MeSH Terms"]:
-                for keywords_l in p_li.find('ul').findChildren("li", recursive=False):
-                    a_tag = keywords_l.find("a", class_="stats-keywords-list-item")
+            if text(first(ieee_strong, p_li)) in ["IEEE Keywords", "INSPEC: Controlled Indexing", "INSPEC: Non-Controlled Indexing", "MeSH Terms"]:
+                for keywords_l in child_lis(first(ieee_ul, p_li)):
+                    a_tag = first(ieee_keyword_a, keywords_l)
                     if a_tag is not None:
-                        keywords.add(str(regex.sub("", a_tag.text.split(",")[0])))
+                        keywords.add(str(regex.sub("", text(a_tag).split(",")[0])))
                     else:
-                        keywords.add(str(regex.sub("", str(keywords_l.text).split(",")[0])))
+                        keywords.add(str(regex.sub("", str(text(keywords_l)).split(",")[0])))
         return list(keywords)
     except Exception as e:
         print(e)
     return None
 
 
-def eurographics_digital_library(soup):
+def eurographics_digital_library(doc):
     try:
         keywords_set = set()
-        p_tablebody = soup.find('table', class_="detailtable").find("tbody")
-        p_trs = p_tablebody.findChildren('tr')
+        p_tablebody = first(eurographics_tbody, first(eurographics_detail_table, doc))
+        p_trs = eurographics_trs(p_tablebody)
         for tr in p_trs:
-            label = tr.find("td", class_="label-cell")
-            if label.text == "dc.subject":
-                keywords = tr.find("td", class_="word-break")
+            label = first(eurographics_label_td, tr)
+            if text(label) == "dc.subject":
+                keywords = first(eurographics_value_td, tr)
                 # e.g. CASE 1: ['Categories and Subject Descriptors (according to ACM CCS): I.4.1 [Image Processing and Computer Vision]: Enhancement-Filtering I.3.3 [Computer Graphics]: Picture/Image Generation-Bitmap and framebuffer operations']
                 # e.g. CASE 2 [TODO: Not taken care of yet] Categories and Subject Descriptors (according to ACM CCS): Information Interfaces And Presentation (e.g., HCI) [H.5.2]: User Interfaces-Graphical user interfaces (GUI)
                 # Step 1: Remove annoying substrings
                 # Step 2: Choose to take ONLY Categories, not the Subject Descriptors > Write a REGEX to take substrings between [].
                 # Step 3: Split the string by , or ; or :
                 to_replaces = ["CCS Concepts", "Categories and Subject Descriptors", "Categories and subject descriptors", "Categories and Subject Descriptors (according to ACM CCS)", "according to ACM CCS"]
-                keywords_str = keywords.text
+                keywords_str = text(keywords)
                 for to_replace in to_replaces:
                     keywords_str = keywords_str.replace(to_replace, "")
                 keywords_extracted = re.findall(r'\[(.*?)\]', keywords_str)
@@ -69,39 +99,39 @@ def eurographics_digital_library(soup):
     return None
 
 
-def springer_v2(soup):
+def springer_v2(doc):
     try:
         keywords = set()
-        keywords_parent_div = soup.find('div', class_="KeywordGroup")
-        keywords_span = keywords_parent_div.findChildren("span", class_="Keyword")
+        keywords_parent_div = first(springer_v2_keywords_div, doc)
+        keywords_span = springer_v2_keyword_spans(keywords_parent_div)
         for k in keywords_span:
-            keywords.add(k.text)
+            keywords.add(text(k))
         return list(keywords)
     except Exception as e:
         print(e)
     return None
 
 
-def dagstuhl(soup):
+def dagstuhl(doc):
     try:
-        keywords_label = soup.find('b', text="Keywords:")
-        keywords_parent_font = keywords_label.parent
-        keywords_parent_td = keywords_parent_font.parent
-        keywords_font = keywords_parent_td.find_next('td').find_next('td').find("font")
+        keywords_label = with_string(dagstuhl_bs(doc), "Keywords:")
+        keywords_parent_font = keywords_label.getparent()
+        keywords_parent_td = keywords_parent_font.getparent()
+        keywords_font = first(dagstuhl_font, first(next_td, first(next_td, keywords_parent_td)))
         if keywords_font is not None:
-            return re.split(',', keywords_font.text)
+            return re.split(',', text(keywords_font))
     except Exception as e:
         print(e)
     return None
 
 
-def springer_v1(soup):
+def springer_v1(doc):
     try:
         keywords = set()
-        keywords_parent_section = soup.find('ul', class_="c-article-subject-list")
-        keywords_li = keywords_parent_section.findChildren("li", class_="c-article-subject-list__subject")
+        keywords_parent_section = first(springer_v1_subjects_ul, doc)
+        keywords_li = springer_v1_subject_lis(keywords_parent_section)
         for k in keywords_li:
-            kw = k.find("span").text
+            kw = text(first(springer_v1_span, k))
             keywords.add(str(regex.sub("", kw)).strip())
         return list(keywords)
     except Exception as e:
@@ -109,11 +139,11 @@ def springer_v1(soup):
     return None
 
 
-def wiley_online_library(soup):
+def wiley_online_library(doc):
     try:
-        keywords_parent_section = soup.find('section', class_="keywords")
-        keywords_ul = keywords_parent_section.find('ul')
-        keywords_lis = keywords_ul.findChildren("li")
+        keywords_parent_section = first(wiley_keywords_section, doc)
+        keywords_ul = first(wiley_ul, keywords_parent_section)
+        keywords_lis = wiley_lis(keywords_ul)
         keywords_set = set()
         for keywords_li in keywords_lis:
 
@@ -123,7 +153,7 @@ def wiley_online_library(soup):
             # Step 2: Choose to take ONLY Categories, not the Subject Descriptors > Write a REGEX to take substrings between [].
             # Step 3: Split the string by , or ; or :
             to_replaces = ["CCS Concepts", "Categories and Subject Descriptors", "Categories and subject descriptors", "Categories and Subject Descriptors (according to ACM CCS)", "according to ACM CCS"]
-            keywords_str = keywords_li.find("a").text
+            keywords_str = text(first(wiley_a, keywords_li))
             for to_replace in to_replaces:
                 keywords_str = keywords_str.replace(to_replace, "")
             keywords_extracted = re.findall(r'\[(.*?)\]', keywords_str)
@@ -142,15 +172,11 @@ def wiley_online_library(soup):
     return None
 
 
-def cogsci(soup):
-    return None
-
-
-def scitepress(soup):
+def scitepress(doc):
     try:
         keywords_set = set()
-        keywords_span = soup.find('span', id="ContentPlaceHolder1_LinkPaperPage_LinkPaperContent_LabelPublicationDetailKeywords")
-        for kw in keywords_span.text.split(","):
+        keywords_span = first(scitepress_keywords_span, doc)
+        for kw in text(keywords_span).split(","):
             keywords_set.add(kw)
         return list(keywords_set)
     except Exception as e:
@@ -158,59 +184,14 @@ def scitepress(soup):
     return None
 
 
-def scienceopen(soup):
+def scienceopen(doc):
     try:
         keywords_set = set()
-        for span_label in soup.find_all('span', class_="so-metadata-label"):
-            if "Keywords" in span_label.text:
-                for keyword_a in span_label.find_next_siblings('a'):
-                    keywords_set.add(keyword_a.text)
+        for span_label in scienceopen_label_spans(doc):
+            if "Keywords" in text(span_label):
+                for keyword_a in scienceopen_next_as(span_label):
+                    keywords_set.add(text(keyword_a))
         return list(keywords_set)
     except Exception as e:
         pass
     return None
-
-
-def aaai(soup):
-    return None
-
-
-def get_keywords(publisher, soup):
-    keywords_list = None
-    if publisher == "acm_digital_library":
-        keywords_list = acm_digital_library(soup)
-
-    elif publisher == "graphics_interface_proceedings":
-        keywords_list = graphics_interface_proceedings(soup)
-
-    elif publisher == "ieee_explore":
-        keywords_list = ieee_explore(soup)
-
-    elif publisher == "cogsci":
-        keywords_list = cogsci(soup)
-
-    elif publisher == "springer_v1":
-        keywords_list = springer_v1(soup)
-
-    elif publisher == "springer_v2":
-        keywords_list = springer_v2(soup)
-
-    elif publisher == "scitepress":
-        keywords_list = scitepress(soup)
-
-    elif publisher == "scienceopen":
-        keywords_list = scienceopen(soup)
-
-    elif publisher == "eurographics_digital_library":
-        keywords_list = eurographics_digital_library(soup)
-
-    elif publisher == "wiley_online_library":
-        keywords_list = wiley_online_library(soup)
-
-    elif publisher == "dagstuhl":
-        keywords_list = dagstuhl(soup)
-
-    elif publisher == "aaai":
-        keywords_list = aaai(soup)
-
-    return None if len(keywords_list) == 0 else keywords_list
@@ -0,0 +1,138 @@
+# External packages
+import html
+import json
+import re
+
+
+# Machine-readable metadata that many publishers embed in their pages, read with a few regexes instead of parsing the page:
+# - Highwire (`citation_*`) and Dublin Core (`dc.*`, `dcterms.*`) <meta> tags in the <head>,
+# - JSON-LD (<script type="application/ld+json">),
+# - IEEE Xplore's `xplGlobal.document.metadata = {...};` script blob.
+# Which of these fields are trusted for which publisher is declared with "metadata" in scrapers/registry.py; the rest are extracted from the DOM.
+
+regex_meta = re.compile(r'<meta\s[^>]*>', re.I)
+regex_attribute = re.compile(r'([\w:.-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.S)
+regex_json_ld = re.compile(r'<script[^>]*type\s*=\s*["\']application/ld\+json["\'][^>]*>(.*?)</script>', re.I | re.S)
+regex_tag = re.compile(r'<[^>]+>')
+regex_whitespace = re.compile(r'[\n\r\t]')
+
+ieee_metadata_marker = "xplGlobal.document.metadata"
+
+# <meta name="..."> of each field, in order of preference.
+meta_abstract_names = ["citation_abstract", "dcterms.abstract", "dc.description"]
+meta_keywords_names = ["citation_keywords", "keywords_list"]
+meta_keyword_names = ["dc.subject", "citation_keyword"]
+
+# Same keyword groups as the IEEE Xplore DOM extractor (see scrapers/keywords.py).
+ieee_keyword_types = ["IEEE Keywords", "INSPEC: Controlled Indexing", "INSPEC: Non-Controlled Indexing", "MeSH Terms"]
+
+json_ld_types = ["ScholarlyArticle", "Article", "Chapter", "CreativeWork"]
+
+
+def _text(value):
+    return html.unescape(regex_tag.sub("", value)).strip()
+
+
+def _meta_tags(page_source):
+    # <meta> tags live in the <head>: don't scan the (much larger) <body>.
+    head_end = page_source.find("</head>")
+    head = page_source if head_end < 0 else page_source[:head_end]
+    tags = dict()
+    for meta in regex_meta.findall(head):
+        attributes = {name.lower(): double if double or not single else single for name, double, single in regex_attribute.findall(meta)}
+        name = attributes.get("name", attributes.get("property", "")).lower()
+        if name and "content" in attributes:
+            tags.setdefault(name, []).append(html.unescape(attributes["content"]).strip())
+    return tags
+
+
+def _from_meta_tags(page_source):
+    tags = _meta_tags(page_source)
+    values = dict()
+    for name in meta_abstract_names:
+        if len(tags.get(name, [""])[0]) > 0:
+            values["abstract"] = tags[name][0]
+            break
+    for name in meta_keywords_names:
+        if name in tags:
+            keywords = [keyword.strip() for value in tags[name] for keyword in re.split(';|,', value) if keyword.strip()]
+            if len(keywords) > 0:
+                values["keywords"] = keywords
+                break
+    if "keywords" not in values:
+        for name in meta_keyword_names:
+            keywords = [keyword for keyword in tags.get(name, []) if keyword]
+            if len(keywords) > 0:
+                values["keywords"] = keywords
+                break
+    return values
+
+
+def _json_ld_objects(data):
+    if isinstance(data, list):
+        for item in data:
+            yield from _json_ld_objects(item)
+    elif isinstance(data, dict):
+        yield data
+        if "@graph" in data:
+            yield from _json_ld_objects(data["@graph"])
+
+
+def _from_json_ld(page_source):
+    values = dict()
+    for script in regex_json_ld.findall(page_source):
+        try:
+            data = json.loads(script)
+        except ValueError:
+            continue
+        for obj in _json_ld_objects(data):
+            types = obj.get("@type", [])
+            types = types if isinstance(types, list) else [types]
+            if not any(obj_type in json_ld_types for obj_type in types):
+                continue
+            abstract = obj.get("abstract", obj.get("description"))
+            if isinstance(abstract, str) and len(abstract.strip()) > 0 and "abstract" not in values:
+                values["abstract"] = _text(abstract)
+            keywords = obj.get("keywords")
+            if isinstance(keywords, str):
+                keywords = re.split(';|,', keywords)
+            if isinstance(keywords, list) and "keywords" not in values:
+                keywords = [_text(str(keyword)) for keyword in keywords if str(keyword).strip()]
+                if len(keywords) > 0:
+                    values["keywords"] = keywords
+    return values
+
+
+def _from_ieee_metadata(page_source):
+    start = page_source.find(ieee_metadata_marker)
+    if start < 0:
+        return dict()
+    start = page_source.find("{", start)
+    try:
+        metadata, end = json.JSONDecoder().raw_decode(page_source, start)
+    except ValueError:
+        return dict()
+
+    values = dict()
+    if isinstance(metadata.get("abstract"), str) and len(metadata["abstract"].strip()) > 0:
+        values["abstract"] = _text(metadata["abstract"])
+    keywords = set()
+    for group in metadata.get("keywords", []) or []:
+        if isinstance(group, dict) and str(group.get("type", "")).strip() in ieee_keyword_types:
+            for keyword in group.get("kwd", []) or []:
+                keywords.add(regex_whitespace.sub("", str(keyword).split(",")[0]))
+    if len(keywords) > 0:
+        values["keywords"] = list(keywords)
+    citation_count = (metadata.get("metrics") or dict()).get("citationCountPaper")
+    if citation_count is not None:
+        values["citation_count"] = str(citation_count)
+    return values
+
+
+# All the fields (abstract, keywords, citation_count) that <page_source> (the raw html) carries as machine-readable metadata.
+def extract_metadata(page_source):
+    values = dict()
+    for source in (_from_ieee_metadata, _from_meta_tags, _from_json_ld):
+        for field, value in source(page_source).items():
+            values.setdefault(field, value)
+    return values
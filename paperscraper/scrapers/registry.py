@@ -0,0 +1,130 @@
+# External packages
+from urllib.parse import urlsplit
+
+# Internal modules
+from scrapers import abstracts, citations, in_page, keywords
+
+
+# Every publisher the scrapers know, with what it provides:
+# - "hosts": the hosts (and their subdomains) the publisher's pages are served from, to tell the publisher of a page from its URL.
+# - "abstract", "citation_count", "keywords": the extractor of each field the publisher's pages show (a function of the parsed page, see
+#   scrapers/dom.py). A field that is NOT listed is never scraped for the publisher: its pages are not even fetched for it.
+# - "ready": CSS selectors of the content the extractors look for on the landing page (see crawler/readiness.py).
+# - "keywords_page": suffix that leads from the landing page's URL to a different page with the keywords, if they are not on the landing page,
+#   and "keywords_ready": the CSS selectors to wait for on that page.
+# - "metadata": the fields that are taken from the metadata embedded in the landing page (see scrapers/metadata.py) when it has them, before
+#   falling back to the extractors. Only list a field if the publisher's embedded value is the same (e.g., not a truncated abstract).
+# - "in_page": the same extractors in JavaScript (see scrapers/in_page.py), to run inside the browser instead of transferring the page, for
+#   publishers that are scraped with the browser (see <config.in_page_extraction>).
+# TODO: [Update as required] Add an entry when adding a new publisher (and list it for its venues in config.interesting_venues).
+publishers = {
+    "aaai": {
+        "hosts": ["aaai.org"],
+        "abstract": abstracts.aaai,
+        "ready": ["div#abstract"],
+        "metadata": ["abstract"],
+    },
+    "acm_digital_library": {
+        "hosts": ["dl.acm.org", "portal.acm.org"],
+        "abstract": abstracts.acm_digital_library,
+        "citation_count": citations.acm_digital_library,
+        "keywords": keywords.acm_digital_library,
+        "ready": ["div.abstractSection", "div.abstractInFull"],
+        "in_page": in_page.acm_digital_library,
+    },
+    "cogsci": {
+        "hosts": ["mindmodeling.org", "escholarship.org"],
+        "abstract": abstracts.cogsci,
+        "ready": ["p#abstract", "span.subAbstract", "blockquote"],
+    },
+    "dagstuhl": {
+        "hosts": ["drops.dagstuhl.de"],
+        "abstract": abstracts.dagstuhl,
+        "keywords": keywords.dagstuhl,
+        "ready": ["div[itemprop='about']"],
+    },
+    "eurographics_digital_library": {
+        "hosts": ["diglib.eg.org"],
+        "abstract": abstracts.eurographics_digital_library,
+        "keywords": keywords.eurographics_digital_library,
+        "ready": ["div.simple-item-view-description"],
+        "keywords_page": "?show=full",
+        "keywords_ready": ["table.detailtable"],
+        "metadata": ["abstract"],
+    },
+    "graphics_interface_proceedings": {
+        "hosts": ["graphicsinterface.org"],
+        "abstract": abstracts.graphics_interface_proceedings,
+        # No "ready": the abstract is the paragraph after the <h3> that says "Abstract", which a CSS selector cannot tell from the page's other
+        # <h3>s, so the page is ready once the document has loaded (see crawler/readiness.py).
+    },
+    "ieee_explore": {
+        "hosts": ["ieeexplore.ieee.org"],
+        "abstract": abstracts.ieee_explore,
+        "citation_count": citations.ieee_explore,
+        "keywords": keywords.ieee_explore,
+        "ready": ["div.abstract-text", "div.article-content"],
+        "keywords_page": "/keywords#keywords",
+        "keywords_ready": ["ul.doc-keywords-list"],
+        "metadata": ["abstract", "citation_count", "keywords"],
+        "in_page": in_page.ieee_explore,
+    },
+    "scienceopen": {
+        "hosts": ["scienceopen.com"],
+        "abstract": abstracts.scienceopen,
+        "citation_count": citations.scienceopen,
+        "keywords": keywords.scienceopen,
+        "ready": ["header.so-layout-section-header"],
+    },
+    "scitepress": {
+        "hosts": ["scitepress.org"],
+        "abstract": abstracts.scitepress,
+        "keywords": keywords.scitepress,
+        "ready": ["span#ContentPlaceHolder1_LinkPaperPage_LinkPaperContent_LabelAbstract"],
+    },
+    "springer_v1": {
+        "hosts": ["link.springer.com"],
+        "abstract": abstracts.springer_v1,
+        "citation_count": citations.springer_v1,
+        "keywords": keywords.springer_v1,
+        "ready": ["div.c-article-section__content"],
+    },
+    "springer_v2": {
+        "hosts": ["link.springer.com"],
+        "abstract": abstracts.springer_v2,
+        "citation_count": citations.springer_v2,
+        "keywords": keywords.springer_v2,
+        "ready": ["section.Abstract"],
+    },
+    "wiley_online_library": {
+        "hosts": ["onlinelibrary.wiley.com"],
+        "abstract": abstracts.wiley_online_library,
+        "citation_count": citations.wiley_online_library,
+        "keywords": keywords.wiley_online_library,
+        "ready": ["div.article-section__content"],
+        "in_page": in_page.wiley_online_library,
+    },
+}
+
+
+# Whether ANY of the <publishers> (of a venue) provides <field>.
+def supports(publishers_list, field):
+    return any(field in publishers.get(publisher, dict()) for publisher in publishers_list)
+
+
+def _serves(publisher, host):
+    return any(host == publisher_host or host.endswith("." + publisher_host) for publisher_host in publishers[publisher].get("hosts", []))
+
+
+# The publisher(s) whose extractors apply to the page at <url> (the final URL, after redirects), by its host. Prefers the <publishers_list> of
+# the paper's venue (in its order), then any other known publisher. Falls back to the whole <publishers_list> for an unknown host.
+# Usually ONE publisher; several only if they share a host (e.g., springer_v1 and springer_v2).
+def resolve(url, publishers_list):
+    host = urlsplit(str(url or "")).netloc.lower().split(":")[0]
+    if host:
+        matches = [publisher for publisher in publishers_list if publisher in publishers and _serves(publisher, host)]
+        if len(matches) == 0:
+            matches = [publisher for publisher in publishers if _serves(publisher, host)]
+        if len(matches) > 0:
+            return matches
+    return list(publishers_list)
@@ -0,0 +1,26 @@
+# External packages
+import json
+import os
+import sys
+
+# The scripts import their modules relative to paperscraper/ (e.g., `from scrapers.extract import extract_all`).
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+path_fixtures = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+path_pages = os.path.join(path_fixtures, "pages")
+
+
+# Saved landing pages (fixtures/pages/) and, per page and publisher, the fields that the BeautifulSoup extractors of scrapers/ produced on them
+# before they were ported to lxml (keywords sorted, an empty list of keywords as None).
+def load_expected():
+    with open(os.path.join(path_fixtures, "expected.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_page(name):
+    with open(os.path.join(path_pages, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def normalize(value):
+    return sorted(value) if isinstance(value, list) else value
@@ -0,0 +1,16 @@
+# External packages
+import pytest
+
+# Internal modules
+from conftest import load_expected, normalize, read_page
+from scrapers.dom import parse_html
+from scrapers.extract import extract_all
+
+fields = ["abstract", "citation_count", "keywords"]
+
+
+# The lxml extractors (see scrapers/dom.py) give the same results as the BeautifulSoup ones they replaced.
+@pytest.mark.parametrize("expected", load_expected(), ids=lambda expected: expected["publisher"] + ":" + expected["page"])
+def test_extract_all(expected):
+    values = extract_all(expected["publisher"], parse_html(read_page(expected["page"])), fields)
+    assert {field: normalize(values[field]) for field in fields} == {field: expected[field] for field in fields}
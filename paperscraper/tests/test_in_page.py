@@ -0,0 +1,32 @@
+# External packages
+import os
+import pytest
+
+# Internal modules
+from conftest import load_expected, normalize, path_pages
+from scrapers.in_page import extract_in_page
+from scrapers.registry import publishers
+import config
+
+# The pages of the publishers that have in-page (JavaScript) extractors, see scrapers/in_page.py.
+in_page_expected = [expected for expected in load_expected() if "in_page" in publishers[expected["publisher"]]]
+
+
+# A headless Chrome (see crawler/driver.py), if one is installed where <config.py> says.
+@pytest.fixture(scope="module")
+def driver():
+    if not os.path.exists(config.path_chromedriver) or not os.path.exists(config.path_chromeoptions_binary):
+        pytest.skip("No Chrome / chromedriver at config.path_chromeoptions_binary / config.path_chromedriver")
+    from crawler.driver import get_webdriver_instance
+    driver = get_webdriver_instance()
+    yield driver
+    driver.quit()
+
+
+# The in-page extractors give the same results as the BeautifulSoup ones that the Python extractors were ported from (see test_extract.py).
+@pytest.mark.parametrize("expected", in_page_expected, ids=lambda expected: expected["publisher"] + ":" + expected["page"])
+def test_extract_in_page(driver, expected):
+    extractors = publishers[expected["publisher"]]["in_page"]
+    driver.get("file://" + os.path.join(path_pages, expected["page"]))
+    values = extract_in_page(driver, extractors, list(extractors))
+    assert {field: normalize(values[field]) for field in extractors} == {field: expected[field] for field in extractors}